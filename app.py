@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import financiero # Nuestro módulo de cálculos
 import graficos   # Nuestro módulo de gráficos
@@ -570,24 +571,25 @@ with tab_A:
             
 
 # Gráfico comparativo: aportes acumulados vs capital sin intereses vs capital con intereses
-            df_crecimiento['Aportes Acumulados'] = df_crecimiento['Aporte'].cumsum()
+            periodos_x = np.arange(len(df_crecimiento))
+            aportes_acumulados = np.cumsum(df_crecimiento['Aporte'])
             fig_comparativo = go.Figure()
             fig_comparativo.add_trace(go.Scatter(
-                x=df_crecimiento.index,
-                y=df_crecimiento['Aportes Acumulados'],
+                x=periodos_x,
+                y=aportes_acumulados,
                 mode='lines+markers',
                 name='Aportes Acumulados',
                 line=dict(color='blue', dash='dot')
             ))
             fig_comparativo.add_trace(go.Scatter(
-                x=df_crecimiento.index,
-                y=df_crecimiento['Saldo Inicial'] + df_crecimiento['Aporte'].cumsum(),
+                x=periodos_x,
+                y=df_crecimiento['Saldo Inicial'] + aportes_acumulados,
                 mode='lines+markers',
                 name='Capital sin intereses',
                 line=dict(color='orange', dash='dash')
             ))
             fig_comparativo.add_trace(go.Scatter(
-                x=df_crecimiento.index,
+                x=periodos_x,
                 y=df_crecimiento['Saldo Final'],
                 mode='lines+markers',
                 name='Capital con intereses',
@@ -620,7 +622,7 @@ with tab_A:
 
             # Reporte detallado
             with st.expander("Ver reporte detallado del crecimiento (Tabla)"):
-                st.dataframe(df_crecimiento.style.format({
+                st.dataframe(df_crecimiento.to_frame().style.format({
                     "Saldo Inicial": "${:,.2f}",
                     "Aporte": "${:,.2f}",
                     "Interés Ganado": "${:,.2f}",
@@ -645,7 +647,10 @@ with tab_B:
         with st.form(key="form_jubilacion"):
             col1, col2 = st.columns(2)
             with col1:
-                tipo_impuesto = st.selectbox("Tipo de Impuesto sobre Ganancia", ["29.5% (Fuente Extranjera)", "5% (Bolsa Local)"])
+                tipo_impuesto = st.selectbox(
+                    "Tipo de Impuesto sobre Ganancia", list(financiero.REGIMENES_IMPUESTO),
+                    format_func=lambda nombre: financiero.REGIMENES_IMPUESTO[nombre]["descripcion"]
+                )
             with col2:
                 tea_retiro = st.slider("Tasa de Retorno durante el Retiro (TEA %)", min_value=0.0, max_value=20.0, value=5.0, step=0.1)
                 anios_pension = st.number_input("Años esperados de retiro", min_value=1, max_value=50, value=25)
@@ -662,9 +667,8 @@ with tab_B:
 
         if submit_button_B:
             ganancia = st.session_state.capital_final_A - st.session_state.aportes_totales_A
-            tasa_impuesto = 0.295 if "29.5%" in tipo_impuesto else 0.05
             impuesto_pagar, capital_neto = financiero.calcular_impuestos(
-                st.session_state.capital_final_A, st.session_state.aportes_totales_A, tasa_impuesto
+                st.session_state.capital_final_A, st.session_state.aportes_totales_A, tipo_impuesto
             )
             factor = 0.5 if factor_pension else 1.0
             pension_mensual = financiero.calcular_pension_mensual(
@@ -716,6 +720,12 @@ with tab_B:
 
                 fig = graficar_escenarios_lineas(df_escenarios)
                 st.plotly_chart(fig, use_container_width=True)
+
+                if len(tasas_extra) > 1 and len(edades_extra) > 1:
+                    df_escenarios_ancho = financiero.calcular_escenarios_jubilacion(
+                        capital_neto, tasas_extra, edades_extra, formato="ancho"
+                    )
+                    st.plotly_chart(graficos.graficar_escenarios_mapa_calor(df_escenarios_ancho), use_container_width=True)
                 
 # =========================
 # MÓDULO C
@@ -758,7 +768,7 @@ with tab_C:
             st.write(interpretar(texto_contexto))
 
             with st.expander("Desglose de Flujos de Caja"):
-                st.dataframe(df_flujos.style.format({
+                st.dataframe(df_flujos.to_frame().style.format({
                     "Flujo (Cupón)":"${:,.2f}",
                     "Flujo Descontado (PV)":"${:,.2f}"
                 }))
@@ -0,0 +1,159 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from cartera import PERFILES, matriz_pesos, pesos_perfil
+
+# Elementos (carteras × inicios × meses) por bloque de ventanas: acota la memoria temporal
+ELEMENTOS_POR_BLOQUE = 1 << 20
+
+# ===================================================================
+# Almacén binario de retornos históricos
+# ===================================================================
+def importar_retornos_csv(ruta_csv, ruta_destino=None):
+    """Convierte un CSV de retornos mensuales a un almacén binario (una sola vez).
+
+    El CSV tiene una columna `fecha` (un mes por fila) y una columna por
+    activo con el retorno simple del mes (0.01 = 1%). Se guardan
+    `<destino>.npy` (activos × meses, float64, cada activo contiguo) y
+    `<destino>.json` con activos y fechas. Devuelve la ruta del `.npy`,
+    que se abre con `abrir_retornos`.
+    """
+    base = os.path.splitext(ruta_destino or ruta_csv)[0]
+    tabla = pd.read_csv(ruta_csv)
+    if "fecha" not in tabla.columns or tabla.shape[1] < 2:
+        raise ValueError("El CSV debe tener una columna fecha y al menos un activo")
+    meses = pd.to_datetime(tabla.pop("fecha")).to_numpy().astype("datetime64[M]")
+    orden = np.argsort(meses, kind="stable")
+    meses = meses[orden]
+    if np.any(np.diff(meses).astype(np.int64) != 1):
+        raise ValueError("Las fechas deben ser meses consecutivos sin repetir")
+    retornos = tabla.to_numpy(dtype=np.float64)[orden]
+    if np.isnan(retornos).any():
+        raise ValueError("Faltan retornos en el CSV")
+    if np.any(retornos <= -1):
+        raise ValueError("Los retornos deben ser mayores a -100%")
+
+    np.save(base + ".npy", np.ascontiguousarray(retornos.T))
+    with open(base + ".json", "w", encoding="utf-8") as archivo:
+        json.dump({"activos": list(tabla.columns), "fechas": [str(m) for m in meses]}, archivo,
+                  ensure_ascii=False, indent=2)
+    _abrir_almacen.cache_clear()  # un almacén reimportado no debe servirse desde la caché
+    return base + ".npy"
+
+@lru_cache(maxsize=8)
+def _abrir_almacen(ruta_npy):
+    base = os.path.splitext(ruta_npy)[0]
+    with open(base + ".json", encoding="utf-8") as archivo:
+        metadatos = json.load(archivo)
+    retornos = np.load(ruta_npy, mmap_mode="r")
+    fechas = np.array(metadatos["fechas"], dtype="datetime64[M]")
+    if retornos.shape != (len(metadatos["activos"]), fechas.size):
+        raise ValueError("El almacén de retornos no coincide con sus metadatos")
+    fechas.setflags(write=False)
+    return tuple(metadatos["activos"]), fechas, retornos
+
+def abrir_retornos(ruta_npy):
+    """Abre el almacén como `(activos, fechas, retornos)` sin leerlo a memoria.
+
+    `retornos` es un memmap de solo lectura (activos × meses): los procesos
+    que abren el mismo archivo comparten sus páginas. Se abre una vez por
+    ruta y proceso (caché).
+    """
+    return _abrir_almacen(os.path.abspath(ruta_npy))
+
+# ===================================================================
+# Backtest con todas las fechas de inicio (ventanas rodantes)
+# ===================================================================
+def _log_crecimiento_acumulado(lista_pesos, ruta_npy):
+    """Suma acumulada del log-crecimiento mensual de cada cartera (carteras × meses+1).
+
+    Cartera rebalanceada cada mes a sus pesos: crecimiento = Σ w · (1 + r).
+    El producto pesos × retornos lee el memmap directamente.
+    """
+    activos, fechas, retornos = abrir_retornos(ruta_npy)
+    pesos = matriz_pesos(lista_pesos, activos)
+
+    acumulado = np.zeros((pesos.shape[0], fechas.size + 1))
+    np.cumsum(np.log(pesos @ retornos + 1), axis=1, out=acumulado[:, 1:])
+    return fechas, acumulado
+
+def _capital_ventanas(acumulado, n_meses, monto_inicial, aporte_mensual):
+    """Capital final de cada ventana de `n_meses` (carteras × inicios).
+
+    El monto inicial capitaliza los n meses y el aporte se hace desde el
+    segundo mes. Las ventanas son vistas de `sliding_window_view` sobre el
+    log-crecimiento acumulado y cada aporte se capitaliza con la diferencia
+    dentro de su ventana, así la precisión no depende del largo de la
+    historia. Las fechas de inicio se recorren por bloques de
+    `ELEMENTOS_POR_BLOQUE` para acotar la memoria temporal.
+    """
+    ventanas = sliding_window_view(acumulado, n_meses + 1, axis=-1)
+    n_carteras, n_inicios = ventanas.shape[:2]
+    por_bloque = max(1, ELEMENTOS_POR_BLOQUE // (n_carteras * n_meses))
+    bufer = np.empty((n_carteras, min(por_bloque, n_inicios), n_meses - 1))
+    capital = np.empty((n_carteras, n_inicios))
+    for desde in range(0, n_inicios, por_bloque):
+        bloque = ventanas[:, desde:desde + por_bloque]
+        fin = bloque[..., -1:]
+        aportes = bufer[:, :bloque.shape[1]]
+        np.subtract(fin, bloque[..., 2:], out=aportes)
+        np.exp(aportes, out=aportes)
+        capital[:, desde:desde + bloque.shape[1]] = (monto_inicial * np.exp(fin[..., 0] - bloque[..., 0])
+                                                     + aporte_mensual * aportes.sum(axis=-1))
+    return capital, ventanas[..., -1] - ventanas[..., 0]
+
+def backtest_rodante(pesos, monto_inicial, aporte_mensual, plazo_anios, ruta_npy):
+    """Repite el crecimiento de la cartera `{activo: peso}` desde cada mes histórico.
+
+    Devuelve un DataFrame con una fila por fecha de inicio: capital final,
+    total aportado y retorno anual equivalente de la cartera en la ventana.
+    """
+    if monto_inicial < 0 or aporte_mensual < 0:
+        raise ValueError("Montos no pueden ser negativos")
+    n_meses = int(plazo_anios * 12)
+    fechas, acumulado = _log_crecimiento_acumulado([pesos], ruta_npy)
+    if n_meses < 1 or n_meses > fechas.size:
+        raise ValueError("El plazo debe caber en la historia disponible")
+
+    capital, log_crecimiento = _capital_ventanas(acumulado, n_meses, monto_inicial, aporte_mensual)
+    inicios = fechas[:fechas.size - n_meses + 1]
+    return pd.DataFrame({
+        "Inicio": inicios.astype(str),
+        "Fin": (inicios + (n_meses - 1)).astype(str),
+        "Capital Final": np.round(capital[0], 2),
+        "Total Aportado": monto_inicial + aporte_mensual * (n_meses - 1),
+        "Retorno Anual": np.expm1(log_crecimiento[0] * 12 / n_meses)
+    })
+
+def backtest_perfiles(monto_inicial, aporte_mensual, plazo_anios, ruta_npy, perfiles=PERFILES):
+    """Resumen del backtest rodante de la cartera recomendada para cada perfil.
+
+    Todas las carteras y fechas de inicio se evalúan en una pasada.
+    Devuelve una fila por perfil con el peor, la mediana y el mejor capital
+    final, percentiles 5/95 y el mes de inicio del peor caso.
+    """
+    if monto_inicial < 0 or aporte_mensual < 0:
+        raise ValueError("Montos no pueden ser negativos")
+    n_meses = int(plazo_anios * 12)
+    fechas, acumulado = _log_crecimiento_acumulado([pesos_perfil(p) for p in perfiles], ruta_npy)
+    if n_meses < 1 or n_meses > fechas.size:
+        raise ValueError("El plazo debe caber en la historia disponible")
+
+    capital, _ = _capital_ventanas(acumulado, n_meses, monto_inicial, aporte_mensual)
+    p5, p50, p95 = np.percentile(capital, [5, 50, 95], axis=1)
+    return pd.DataFrame({
+        "Perfil": list(perfiles),
+        "Ventanas": capital.shape[1],
+        "Peor": np.round(capital.min(axis=1), 2),
+        "P5": np.round(p5, 2),
+        "P50": np.round(p50, 2),
+        "P95": np.round(p95, 2),
+        "Mejor": np.round(capital.max(axis=1), 2),
+        "Inicio del Peor": fechas[capital.argmin(axis=1)].astype(str),
+        "Total Aportado": monto_inicial + aporte_mensual * (n_meses - 1)
+    })
@@ -0,0 +1,434 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from financiero import validar_crecimiento
+from simulacion import BosquejoCuantiles, percentiles_bosquejo, resumir_simulacion
+
+# Supuestos de mercado por activo (retorno esperado, volatilidad, correlaciones)
+RUTA_SUPUESTOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "supuestos_activos.json")
+
+PERFILES = ("conservador", "moderado", "agresivo")
+
+# Trayectorias por bloque: acota la memoria (trayectorias × meses × activos)
+TAMANO_BLOQUE = 1000
+
+# ===================================================================
+# Supuestos de mercado
+# ===================================================================
+@lru_cache(maxsize=4)
+def _supuestos(ruta):
+    """Lee los supuestos una sola vez y precalcula los parámetros mensuales.
+
+    Devuelve `(activos, media_log, cholesky)`: media mensual del log-retorno
+    de cada activo y factor de Cholesky de la covarianza mensual de los
+    log-retornos (lognormal con la TEA esperada y la volatilidad anual del
+    archivo).
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        supuestos = json.load(archivo)
+    activos = tuple(supuestos["activos"])
+    retorno = np.asarray(supuestos["retorno_esperado"], dtype=float)
+    volatilidad = np.asarray(supuestos["volatilidad"], dtype=float)
+    correlaciones = np.asarray(supuestos["correlaciones"], dtype=float)
+    if retorno.shape != (len(activos),) or volatilidad.shape != retorno.shape \
+            or correlaciones.shape != (len(activos), len(activos)):
+        raise ValueError("Los supuestos deben tener un valor por activo y una matriz de correlaciones cuadrada")
+    if np.any(retorno <= -1) or np.any(volatilidad < 0):
+        raise ValueError("Supuestos de retorno o volatilidad no válidos")
+
+    # Lognormal anual: log(1 + R) ~ N(m, s²) con E[R] = retorno y desvío = volatilidad
+    sigma = np.sqrt(np.log1p((volatilidad / (1 + retorno)) ** 2))
+    media_log = (np.log1p(retorno) - sigma ** 2 / 2) / 12
+    covarianza = correlaciones * np.outer(sigma, sigma) / 12
+    try:
+        cholesky = np.linalg.cholesky(covarianza)
+    except np.linalg.LinAlgError as error:
+        raise ValueError("La matriz de correlaciones debe ser definida positiva") from error
+    media_log.setflags(write=False)
+    cholesky.setflags(write=False)
+    return activos, media_log, cholesky
+
+def pesos_perfil(perfil):
+    """Pesos (fracciones) de `PerfilInversor.obtener_distribucion_activos`."""
+    # Importación diferida: perfil_inversor carga scikit-learn
+    from perfil_inversor import PerfilInversor
+
+    distribucion = PerfilInversor.obtener_distribucion_activos(perfil)
+    return {activo: peso / 100 for activo, peso in distribucion.items() if activo != "Descripción"}
+
+def matriz_pesos(lista_pesos, activos):
+    """Matriz carteras × activos con los pesos alineados al orden de `activos`.
+
+    La usan también los backtests, con los activos del almacén histórico.
+    """
+    matriz = np.zeros((len(lista_pesos), len(activos)))
+    for i, pesos in enumerate(lista_pesos):
+        faltantes = set(pesos) - set(activos)
+        if faltantes:
+            raise ValueError(f"Activos no disponibles: {', '.join(sorted(faltantes))}")
+        for activo, peso in pesos.items():
+            matriz[i, activos.index(activo)] = peso
+    if np.any(matriz < 0) or not np.allclose(matriz.sum(axis=1), 1.0):
+        raise ValueError("Los pesos de cada cartera deben ser no negativos y sumar 100%")
+    return matriz
+
+def _retornos_bloque(rng, n_trayectorias, n_periodos, media_log, cholesky):
+    """Factores de crecimiento mensuales correlacionados (trayectorias × meses × activos)."""
+    factores = rng.standard_normal((n_trayectorias, n_periodos, media_log.size))
+    factores = factores @ cholesky.T
+    factores += media_log
+    return np.exp(factores, out=factores)
+
+# ===================================================================
+# Simulación de carteras por perfil
+# ===================================================================
+def _validar(monto_inicial, aporte_mensual, plazo_anios, n_trayectorias, tamano_bloque):
+    # La tasa sale de los supuestos de mercado, no de un parámetro
+    validar_crecimiento(monto_inicial, aporte_mensual, 0.0, plazo_anios)
+    if n_trayectorias < 1 or tamano_bloque < 1:
+        raise ValueError("Debe simular al menos una trayectoria")
+
+def _simular_carteras(lista_pesos, monto_inicial, aporte_mensual, plazo_anios, n_trayectorias, semilla,
+                      tamano_bloque, capital_objetivo, error_relativo, ruta):
+    """Simula varias carteras sobre los mismos retornos de los activos.
+
+    Cada bloque genera una sola vez los retornos correlacionados de todos
+    los activos y los combina con la matriz de pesos; así los perfiles se
+    comparan con los mismos escenarios de mercado. Los pesos se mantienen
+    constantes (rebalanceo mensual al objetivo).
+    """
+    _validar(monto_inicial, aporte_mensual, plazo_anios, n_trayectorias, tamano_bloque)
+    activos, media_log, cholesky = _supuestos(ruta)
+    pesos = matriz_pesos(lista_pesos, activos)
+    n_carteras = pesos.shape[0]
+    n_periodos = int(plazo_anios * 12)
+
+    n_bloques = -(-n_trayectorias // tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(n_bloques)
+    bosquejos = [BosquejoCuantiles(error_relativo, tamano_bloque) for _ in range(n_carteras)]
+    suma_saldos = np.zeros((n_periodos, n_carteras))
+    suma = np.zeros(n_carteras)
+    suma_cuadrados = np.zeros(n_carteras)
+    minimo = np.full(n_carteras, np.inf)
+    maximo = np.full(n_carteras, -np.inf)
+    alcanzan = np.zeros(n_carteras, dtype=np.int64)
+
+    for i, semilla_bloque in enumerate(semillas):
+        n = min(tamano_bloque, n_trayectorias - i * tamano_bloque)
+        retornos = _retornos_bloque(np.random.default_rng(semilla_bloque), n, n_periodos, media_log, cholesky)
+        crecimiento = np.cumprod(retornos @ pesos.T, axis=1)  # trayectorias × meses × carteras
+
+        # Sin aporte en el primer mes: V_t = P_t · (M + a · Σ_{2 ≤ k ≤ t} 1 / P_k), con P_t el crecimiento acumulado
+        aportes_descontados = aporte_mensual / crecimiento
+        aportes_descontados[:, 0] = 0.0
+        saldos = crecimiento * (monto_inicial + np.cumsum(aportes_descontados, axis=1))
+
+        final = saldos[:, -1]
+        suma_saldos += saldos.sum(axis=0)
+        suma += final.sum(axis=0)
+        suma_cuadrados += (final ** 2).sum(axis=0)
+        minimo = np.minimum(minimo, final.min(axis=0))
+        maximo = np.maximum(maximo, final.max(axis=0))
+        if capital_objetivo is not None:
+            alcanzan += np.count_nonzero(final >= capital_objetivo, axis=0)
+        for j, bosquejo in enumerate(bosquejos):
+            bosquejo.agregar(final[:, j])
+
+    total_aportado = monto_inicial + aporte_mensual * (n_periodos - 1)
+    return [
+        resumir_simulacion(bosquejos[j], suma[j], suma_cuadrados[j], minimo[j], maximo[j], alcanzan[j],
+                           suma_saldos[:, j], n_trayectorias, capital_objetivo, total_aportado)
+        for j in range(n_carteras)
+    ]
+
+def simular_cartera(pesos, monto_inicial, aporte_mensual, plazo_anios, n_trayectorias=10000, semilla=None,
+                    capital_objetivo=None, tamano_bloque=TAMANO_BLOQUE, error_relativo=0.001,
+                    ruta=RUTA_SUPUESTOS):
+    """Simula el valor de una cartera `{activo: peso}` con retornos correlacionados.
+
+    Los retornos mensuales de los activos son lognormales correlacionados
+    (Cholesky de la covarianza de `supuestos_activos.json`). Devuelve un
+    dict con las mismas claves que `simulacion.simular_crecimiento_cartera`.
+    """
+    return _simular_carteras([pesos], monto_inicial, aporte_mensual, plazo_anios, n_trayectorias, semilla,
+                             tamano_bloque, capital_objetivo, error_relativo, ruta)[0]
+
+def simular_perfiles(monto_inicial, aporte_mensual, plazo_anios, perfiles=PERFILES, n_trayectorias=10000,
+                     semilla=None, capital_objetivo=None, tamano_bloque=TAMANO_BLOQUE, error_relativo=0.001,
+                     ruta=RUTA_SUPUESTOS):
+    """Distribución del valor final de la cartera recomendada para cada perfil.
+
+    Todos los perfiles se simulan sobre los mismos escenarios de mercado.
+    Devuelve un DataFrame con una fila por perfil; los percentiles son
+    exactos si las trayectorias caben en un bloque y aproximados si no
+    (`attrs["percentiles_exactos"]`).
+    """
+    resultados = _simular_carteras([pesos_perfil(perfil) for perfil in perfiles], monto_inicial,
+                                   aporte_mensual, plazo_anios, n_trayectorias, semilla, tamano_bloque,
+                                   capital_objetivo, error_relativo, ruta)
+    tabla = pd.DataFrame([
+        {
+            "Perfil": perfil,
+            **resultado["percentiles"],
+            "Capital Medio": resultado["capital_medio"],
+            "Desviación": resultado["desviacion"],
+            "Probabilidad Objetivo": resultado["probabilidad_objetivo"],
+            "Total Aportado": resultado["total_aportado"]
+        }
+        for perfil, resultado in zip(perfiles, resultados)
+    ])
+    tabla.attrs["percentiles_exactos"] = all(r["percentiles_exactos"] for r in resultados)
+    return tabla
+
+# ===================================================================
+# Rebalanceo: calendario y umbral, con costos de transacción
+# ===================================================================
+ESTRATEGIAS_REBALANCEO = ("ninguno", "calendario", "umbral")
+
+def _parametros_estrategia(estrategia):
+    """Normaliza una estrategia a `(nombre, cada_meses, umbral)`.
+
+    Acepta el nombre solo o un dict con "estrategia" y sus parámetros:
+    "cada_meses" (calendario, por defecto 12) o "umbral" (desvío máximo
+    de cualquier peso respecto del objetivo, por defecto 5 pp).
+    """
+    if isinstance(estrategia, str):
+        estrategia = {"estrategia": estrategia}
+    nombre = estrategia.get("estrategia")
+    if nombre not in ESTRATEGIAS_REBALANCEO:
+        raise ValueError("Estrategia de rebalanceo no válida")
+    cada_meses = int(estrategia.get("cada_meses", 12)) if nombre == "calendario" else 0
+    umbral = float(estrategia.get("umbral", 0.05)) if nombre == "umbral" else np.inf
+    if nombre == "calendario" and cada_meses < 1:
+        raise ValueError("El rebalanceo por calendario requiere cada_meses ≥ 1")
+    if nombre == "umbral" and not 0 < umbral < 1:
+        raise ValueError("El umbral debe estar entre 0 y 1")
+    return nombre, cada_meses, umbral
+
+def comparar_estrategias_rebalanceo(pesos, monto_inicial, aporte_mensual, plazo_anios,
+                                    estrategias=("ninguno", "calendario", "umbral"), costo_transaccion=0.001,
+                                    n_trayectorias=10000, semilla=None, capital_objetivo=None,
+                                    tamano_bloque=TAMANO_BLOQUE, error_relativo=0.001, ruta=RUTA_SUPUESTOS):
+    """Simula estrategias de rebalanceo sobre los mismos escenarios de mercado.
+
+    Entre rebalanceos los pesos derivan con los retornos; los aportes se
+    invierten según los pesos objetivo. Cada mes se arma una máscara
+    estrategias × trayectorias con las carteras que rebalancean (por
+    calendario, o porque algún peso se desvía más que el umbral) y se
+    aplica a todas a la vez. El costo es `costo_transaccion` por unidad
+    operada (compras + ventas), calculado sobre las operaciones hacia los
+    pesos objetivo y descontado del valor de la cartera.
+
+    Devuelve un DataFrame con una fila por estrategia: percentiles del
+    valor final, rotación anual media (mitad de lo operado sobre el valor),
+    costos totales medios y cantidad media de rebalanceos. Los percentiles
+    son exactos si las trayectorias caben en un bloque y aproximados si no
+    (`attrs["percentiles_exactos"]`).
+    """
+    _validar(monto_inicial, aporte_mensual, plazo_anios, n_trayectorias, tamano_bloque)
+    if costo_transaccion < 0:
+        raise ValueError("El costo de transacción no puede ser negativo")
+    activos, media_log, cholesky = _supuestos(ruta)
+    objetivo = matriz_pesos([pesos], activos)[0]
+    # Solo los activos de la cartera: Cholesky de su submatriz de covarianza
+    en_cartera = np.flatnonzero(objetivo)
+    objetivo = objetivo[en_cartera]
+    covarianza = cholesky @ cholesky.T
+    media_log = media_log[en_cartera]
+    cholesky = np.linalg.cholesky(covarianza[np.ix_(en_cartera, en_cartera)])
+
+    parametros = [_parametros_estrategia(e) for e in estrategias]
+    cada_meses = np.array([p[1] for p in parametros])
+    umbral = np.array([p[2] for p in parametros])
+    # Las estrategias sin umbral (inf) no comparan: evita inf · 0 con carteras vacías
+    con_umbral = np.isfinite(umbral)
+    umbral = np.where(con_umbral, umbral, 0.0)
+    n_estrategias = len(parametros)
+    n_periodos = int(plazo_anios * 12)
+
+    n_bloques = -(-n_trayectorias // tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(n_bloques)
+    bosquejos = [BosquejoCuantiles(error_relativo, tamano_bloque) for _ in range(n_estrategias)]
+    suma = np.zeros(n_estrategias)
+    alcanzan = np.zeros(n_estrategias, dtype=np.int64)
+    suma_rotacion = np.zeros(n_estrategias)
+    suma_costos = np.zeros(n_estrategias)
+    suma_rebalanceos = np.zeros(n_estrategias)
+
+    for i, semilla_bloque in enumerate(semillas):
+        n = min(tamano_bloque, n_trayectorias - i * tamano_bloque)
+        # Orden meses × activos × trayectorias: las sumas y máximos por activo
+        # operan sobre vectores contiguos de trayectorias
+        retornos = _retornos_bloque(np.random.default_rng(semilla_bloque), n_periodos, n, media_log, cholesky)
+        retornos = np.ascontiguousarray(retornos.transpose(0, 2, 1))
+        tenencias = np.broadcast_to(monto_inicial * objetivo, (n_estrategias, n, objetivo.size)).copy()
+        tenencias = np.ascontiguousarray(tenencias.transpose(0, 2, 1))  # estrategias × activos × trayectorias
+        rotacion = np.zeros((n_estrategias, n))
+        costos = np.zeros((n_estrategias, n))
+        rebalanceos = np.zeros((n_estrategias, n))
+
+        for t in range(n_periodos):
+            tenencias *= retornos[t]
+            if t > 0:
+                tenencias += aporte_mensual * objetivo[:, None]
+            valor = tenencias.sum(axis=1)
+            desvio = valor[:, None, :] * objetivo[:, None]
+            desvio -= tenencias
+            np.abs(desvio, out=desvio)
+
+            # Máscara estrategias × trayectorias de carteras que rebalancean este mes
+            por_calendario = (cada_meses > 0) & ((t + 1) % np.maximum(cada_meses, 1) == 0)
+            por_umbral = con_umbral[:, None] & (desvio.max(axis=1) > umbral[:, None] * valor)
+            rebalancea = por_calendario[:, None] | por_umbral
+            if not rebalancea.any():
+                continue
+            operado = desvio.sum(axis=1)
+            operado *= rebalancea
+            costo = costo_transaccion * operado
+            np.copyto(tenencias, (valor - costo)[:, None, :] * objetivo[:, None], where=rebalancea[:, None, :])
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rotacion += np.where(valor > 0, operado / 2 / valor, 0.0)
+            costos += costo
+            rebalanceos += rebalancea
+
+        final = tenencias.sum(axis=1)
+        suma += final.sum(axis=1)
+        suma_rotacion += rotacion.sum(axis=1)
+        suma_costos += costos.sum(axis=1)
+        suma_rebalanceos += rebalanceos.sum(axis=1)
+        if capital_objetivo is not None:
+            alcanzan += np.count_nonzero(final >= capital_objetivo, axis=1)
+        for j, bosquejo in enumerate(bosquejos):
+            bosquejo.agregar(final[j])
+
+    tabla = pd.DataFrame([
+        {
+            "Estrategia": nombre,
+            **percentiles_bosquejo(bosquejos[j]),
+            "Capital Medio": round(suma[j] / n_trayectorias, 2),
+            "Rotación Anual Media": suma_rotacion[j] / n_trayectorias / plazo_anios,
+            "Costos Medios": round(suma_costos[j] / n_trayectorias, 2),
+            "Rebalanceos Medios": suma_rebalanceos[j] / n_trayectorias,
+            "Probabilidad Objetivo": None if capital_objetivo is None else alcanzan[j] / n_trayectorias
+        }
+        for j, (nombre, _, _) in enumerate(parametros)
+    ])
+    tabla.attrs["percentiles_exactos"] = all(bosquejo.exacto for bosquejo in bosquejos)
+    return tabla
+
+# ===================================================================
+# Glide path: de la cartera agresiva a la conservadora
+# ===================================================================
+CRITERIOS_GLIDE_PATH = ("edad", "retiro")
+
+def _fraccion_conservadora(edad, anios_restantes, criterio, edad_inicio, edad_fin, anios_transicion):
+    """Fracción de la cartera conservadora (0 = agresiva, 1 = conservadora).
+
+    Con `criterio="edad"` avanza linealmente entre `edad_inicio` y
+    `edad_fin` (por defecto 50 → 65, la edad desde la que
+    `generar_recomendaciones` aconseja reducir el riesgo); con "retiro",
+    durante los últimos `anios_transicion` años antes del retiro.
+    """
+    if criterio == "edad":
+        fraccion = (edad - edad_inicio) / (edad_fin - edad_inicio)
+    else:
+        fraccion = 1 - (anios_restantes - 1) / anios_transicion
+    return np.clip(fraccion, 0.0, 1.0)
+
+def _pesos_glide_path(pesos_inicio, pesos_fin, ruta):
+    activos, media_log, cholesky = _supuestos(ruta)
+    pesos = matriz_pesos([pesos_inicio or pesos_perfil("agresivo"), pesos_fin or pesos_perfil("conservador")],
+                         activos)
+    return activos, media_log, cholesky, pesos
+
+def calcular_glide_path(edad, anios_hasta_retiro, criterio="edad", edad_inicio=50, edad_fin=65,
+                        anios_transicion=15, pesos_inicio=None, pesos_fin=None, ruta=RUTA_SUPUESTOS):
+    """Pesos año por año (filas) de cada activo (columnas) hasta el retiro.
+
+    Por defecto va de la distribución "agresivo" a la "conservador" de
+    `PerfilInversor.obtener_distribucion_activos`.
+    """
+    if criterio not in CRITERIOS_GLIDE_PATH:
+        raise ValueError("Criterio no válido: use edad o retiro")
+    activos, _, _, pesos = _pesos_glide_path(pesos_inicio, pesos_fin, ruta)
+    anios = np.arange(int(anios_hasta_retiro))
+    fraccion = _fraccion_conservadora(edad + anios, anios_hasta_retiro - anios, criterio, edad_inicio, edad_fin,
+                                      anios_transicion)
+    trayectoria = (1 - fraccion)[:, None] * pesos[0] + fraccion[:, None] * pesos[1]
+    usados = np.flatnonzero(pesos.sum(axis=0))
+    tabla = pd.DataFrame(np.round(trayectoria[:, usados] * 100, 2), columns=[activos[i] for i in usados])
+    tabla.insert(0, "Edad", edad + anios)
+    tabla.insert(0, "Año", anios + 1)
+    return tabla
+
+def _capital_proyectado(crecimiento_mensual, vigente, monto_inicial, aporte_mensual):
+    """Capital esperado al retiro por cliente (clientes × años, años rellenados).
+
+    Por año: V_y = V_{y-1} · r^12 + aportes capitalizados del año, sin
+    aporte en el primer mes.
+    Se resuelve con productos y sumas acumuladas sobre el eje de años.
+    """
+    meses_con_aporte = np.where(np.arange(vigente.shape[1]) == 0, 11, 12)
+    crecimiento_anual = np.where(vigente, crecimiento_mensual ** 12, 1.0)
+    con_tasa = crecimiento_mensual != 1
+    divisor = np.where(con_tasa, crecimiento_mensual - 1, 1.0)
+    factor_aportes = np.where(con_tasa, (crecimiento_mensual ** meses_con_aporte - 1) / divisor, meses_con_aporte)
+    aportes = np.where(vigente, aporte_mensual[:, None] * factor_aportes, 0.0)
+
+    acumulado = np.cumprod(crecimiento_anual, axis=1)
+    return acumulado[:, -1] * (monto_inicial + np.sum(aportes / acumulado, axis=1))
+
+def proyectar_cohorte_glide_path(edades, anios_hasta_retiro, monto_inicial, aporte_mensual, criterio="edad",
+                                 edad_inicio=50, edad_fin=65, anios_transicion=15, pesos_inicio=None,
+                                 pesos_fin=None, ruta=RUTA_SUPUESTOS):
+    """Capital esperado al retiro de una cohorte de clientes con glide path.
+
+    `edades`, `anios_hasta_retiro` (años enteros), `monto_inicial` y
+    `aporte_mensual` son escalares o arreglos por cliente (broadcasting).
+    Los horizontes distintos se igualan con una máscara clientes × años.
+    El retorno esperado mensual de la cartera es lineal en los pesos, así
+    que la grilla completa sale de las fracciones del glide path sin
+    recorrer activos. Para comparar se incluyen las carteras fijas
+    agresiva y conservadora.
+    """
+    if criterio not in CRITERIOS_GLIDE_PATH:
+        raise ValueError("Criterio no válido: use edad o retiro")
+    edades, horizonte, monto_inicial, aporte_mensual = (x.ravel() for x in np.broadcast_arrays(
+        np.asarray(edades, dtype=float), np.asarray(anios_hasta_retiro, dtype=float),
+        np.asarray(monto_inicial, dtype=float), np.asarray(aporte_mensual, dtype=float)
+    ))
+    if np.any(monto_inicial < 0) or np.any(aporte_mensual < 0):
+        raise ValueError("Montos no pueden ser negativos")
+    if np.any(horizonte < 1) or np.any(horizonte != np.round(horizonte)):
+        raise ValueError("Los años hasta el retiro deben ser enteros ≥ 1")
+
+    _, media_log, cholesky, pesos = _pesos_glide_path(pesos_inicio, pesos_fin, ruta)
+    # Crecimiento mensual esperado de cada activo: E[e^X] = e^(μ + σ²/2)
+    crecimiento_activos = np.exp(media_log + (cholesky ** 2).sum(axis=1) / 2)
+    crecimiento_agresivo, crecimiento_conservador = pesos @ crecimiento_activos
+
+    anios = np.arange(int(horizonte.max()))
+    vigente = anios[None, :] < horizonte[:, None]
+    fraccion = _fraccion_conservadora(edades[:, None] + anios, horizonte[:, None] - anios, criterio,
+                                      edad_inicio, edad_fin, anios_transicion)
+    crecimiento = (1 - fraccion) * crecimiento_agresivo + fraccion * crecimiento_conservador
+
+    def proyectar(crecimiento_mensual):
+        return np.round(_capital_proyectado(np.broadcast_to(crecimiento_mensual, vigente.shape), vigente,
+                                            monto_inicial, aporte_mensual), 2)
+
+    ultimo_anio = (horizonte - 1).astype(int)
+    return pd.DataFrame({
+        "Edad": edades,
+        "Años al Retiro": horizonte.astype(int),
+        "Capital Proyectado": proyectar(crecimiento),
+        "Capital Agresivo Fijo": proyectar(crecimiento_agresivo),
+        "Capital Conservador Fijo": proyectar(crecimiento_conservador),
+        "Total Aportado": monto_inicial + aporte_mensual * (12 * horizonte - 1),
+        "Fracción Conservadora al Retiro": fraccion[np.arange(edades.size), ultimo_anio]
+    })
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+class Cronograma:
+    """Cronograma por período respaldado por un arreglo contiguo por columna.
+
+    Guarda cada columna como un arreglo float64 de solo lectura (mismos
+    nombres que las tablas de `financiero`) y solo construye un DataFrame
+    cuando se llama a `to_frame()`. Admite:
+
+    - `cronograma["Saldo Final"]`: arreglo de la columna.
+    - `cronograma[10:20]`: otro cronograma (vistas, sin copiar).
+    - `cronograma[i]`: la fila i como dict.
+    - iteración fila por fila (dicts), `iterrows()` al estilo pandas,
+      `ultimo()` y `totales()` para resúmenes.
+    """
+
+    __slots__ = ("_columnas", "_enteras")
+
+    def __init__(self, columnas, enteras=("Periodo",)):
+        self._columnas = {}
+        for nombre, valores in columnas.items():
+            arreglo = np.ascontiguousarray(valores, dtype=np.float64).view()
+            if arreglo.ndim != 1:
+                raise ValueError("Cada columna debe ser unidimensional")
+            arreglo.flags.writeable = False
+            self._columnas[nombre] = arreglo
+        if len({a.size for a in self._columnas.values()}) > 1:
+            raise ValueError("Todas las columnas deben tener el mismo largo")
+        # Columnas que se muestran como enteros (p. ej. el número de período)
+        self._enteras = tuple(nombre for nombre in enteras if nombre in self._columnas)
+
+    @property
+    def columnas(self):
+        return list(self._columnas)
+
+    def __len__(self):
+        return next(iter(self._columnas.values())).size if self._columnas else 0
+
+    def __contains__(self, nombre):
+        return nombre in self._columnas
+
+    def _fila(self, i):
+        return {
+            nombre: int(arreglo[i]) if nombre in self._enteras else float(arreglo[i])
+            for nombre, arreglo in self._columnas.items()
+        }
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            return self._columnas[clave]
+        if isinstance(clave, slice):
+            return Cronograma({n: a[clave] for n, a in self._columnas.items()}, self._enteras)
+        return self._fila(clave)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._fila(i)
+
+    def iterrows(self):
+        """Itera `(indice, fila)` como `DataFrame.iterrows`, sin usar pandas."""
+        return enumerate(self)
+
+    def ultimo(self):
+        """Última fila (p. ej. el saldo final del cronograma)."""
+        return self._fila(-1)
+
+    def totales(self):
+        """Suma de cada columna no entera (aportes, intereses, flujos...)."""
+        return {
+            nombre: float(arreglo.sum())
+            for nombre, arreglo in self._columnas.items()
+            if nombre not in self._enteras
+        }
+
+    def to_frame(self):
+        """Construye el DataFrame equivalente (única operación que usa pandas)."""
+        return pd.DataFrame({
+            nombre: arreglo.astype(np.int64) if nombre in self._enteras else arreglo.copy()
+            for nombre, arreglo in self._columnas.items()
+        })
+
+    def __repr__(self):
+        return f"Cronograma({len(self)} períodos, columnas={self.columnas})"
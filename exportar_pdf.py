@@ -14,7 +14,11 @@ class PDF(FPDF):
         
 
 def crear_reporte_jubilacion(df_crecimiento, capital_final, total_aportado, df_escenarios: pd.DataFrame = None):
-    """Crea un PDF con los resultados del Módulo A y comparaciones de escenarios (opcional)."""
+    """Crea un PDF con los resultados del Módulo A y comparaciones de escenarios (opcional).
+
+    `df_crecimiento` puede ser el `Cronograma` de calcular_crecimiento_cartera
+    o un DataFrame con las mismas columnas.
+    """
     
     pdf = PDF()
     pdf.add_page()
@@ -43,7 +47,7 @@ def crear_reporte_jubilacion(df_crecimiento, capital_final, total_aportado, df_e
     
     pdf.set_font('Arial', '', 9)
     for i, row in df_crecimiento.iterrows():  # Solo primeras 20 filas
-        pdf.cell(25, 6, str(row['Periodo']), 1)
+        pdf.cell(25, 6, str(int(row['Periodo'])), 1)
         pdf.cell(50, 6, f"${row['Saldo Inicial']:,.2f}", 1)
         pdf.cell(40, 6, f"${row['Aporte']:,.2f}", 1)
         pdf.cell(40, 6, f"${row['Interés Ganado']:,.2f}", 1)
@@ -1,9 +1,14 @@
+import math
+import os
 import pandas as pd
 import numpy as np
-import numpy_financial as npf
+from functools import lru_cache
+
+from cronograma import Cronograma
 
 # --- Diccionario de Frecuencias ---
 FRECUENCIAS = {
+    "Diaria": 365,
     "Mensual": 12,
     "Bimestral": 6,
     "Trimestral": 4,
@@ -23,11 +28,148 @@ def convertir_tea_a_tep(tea, frecuencia_destino):
     tep = (1 + tea) ** (1 / n_periodos) - 1
     return tep
 
+# --- Capitalización continua ---
+# Con una TEA la capitalización continua no cambia el crecimiento por
+# período: e^(δ/n) = (1 + TEA)^(1/n), con δ = ln(1 + TEA) la fuerza de
+# interés. Solo importa al partir de una tasa nominal anual.
+CAPITALIZACION_CONTINUA = "Continua"
+
+def convertir_tasa_nominal_a_tea(tasa_nominal, capitalizacion):
+    """Convierte una tasa nominal anual a TEA según su capitalización.
+
+    `capitalizacion` es una frecuencia de FRECUENCIAS (p. ej. "Diaria") o
+    "Continua" (TEA = e^tasa − 1).
+    """
+    if capitalizacion == CAPITALIZACION_CONTINUA:
+        return float(np.expm1(tasa_nominal))
+    n_periodos = FRECUENCIAS.get(capitalizacion)
+    if not n_periodos:
+        raise ValueError("Frecuencia no válida")
+    return (1 + tasa_nominal / n_periodos) ** n_periodos - 1
+
+def convertir_tea_a_fuerza_interes(tea):
+    """Tasa continua equivalente (fuerza de interés δ = ln(1 + TEA))."""
+    if tea <= -1:
+        raise ValueError("La TEA debe ser mayor a -100%")
+    return float(np.log1p(tea))
+
+# --- Caché de factores de crecimiento y descuento ---
+TAMANO_CACHE_FACTORES = 256
+
+@lru_cache(maxsize=TAMANO_CACHE_FACTORES)
+def _factores_tasa(tea, frecuencia, n_periodos):
+    tep = convertir_tea_a_tep(tea, frecuencia)
+    crecimiento = (1 + tep) ** np.arange(1, n_periodos + 1)
+    descuento = 1 / crecimiento
+    crecimiento.setflags(write=False)
+    descuento.setflags(write=False)
+    return tep, crecimiento, descuento
+
+def obtener_factores_tasa(tea, frecuencia, n_periodos):
+    """Devuelve `(tep, factores_crecimiento, factores_descuento)` para t = 1..n.
+
+    Los resultados se guardan en una caché LRU acotada por (TEA, frecuencia,
+    horizonte), compartida por crecimiento, jubilación y bonos. Los arreglos
+    son de solo lectura: copiarlos antes de modificarlos.
+    """
+    return _factores_tasa(float(tea), frecuencia, int(n_periodos))
+
+@lru_cache(maxsize=TAMANO_CACHE_FACTORES)
+def _factor_final_tasa(tea, frecuencia, n_periodos):
+    tep = convertir_tea_a_tep(tea, frecuencia)
+    return tep, (1 + tep) ** n_periodos
+
+def obtener_factor_final(tea, frecuencia, n_periodos):
+    """Devuelve `(tep, (1 + tep)^n)` sin construir los factores intermedios.
+
+    Para quien solo necesita el último factor (p. ej. la pensión). Tiene su
+    propia caché LRU, del mismo tamaño; admite horizontes no enteros.
+    """
+    return _factor_final_tasa(float(tea), frecuencia, float(n_periodos))
+
+def _factores_finales_lote(tea, frecuencia, n_periodos):
+    """`(tep, (1 + tep)^n)` para arreglos de TEA y horizontes (broadcasting).
+
+    Si las combinaciones distintas caben en la caché (grillas de
+    escenarios, clientes con los mismos supuestos) se resuelven con
+    `obtener_factor_final`; si no, se calculan vectorizadas.
+    """
+    tea, n_periodos = np.broadcast_arrays(np.asarray(tea, dtype=float), np.asarray(n_periodos, dtype=float))
+    pares, inversa = np.unique(np.stack((tea.ravel(), n_periodos.ravel())), axis=1, return_inverse=True)
+    if pares.shape[1] > TAMANO_CACHE_FACTORES:
+        tep = (1 + tea) ** (1 / FRECUENCIAS[frecuencia]) - 1
+        return tep, (1 + tep) ** n_periodos
+    valores = np.array([obtener_factor_final(t, frecuencia, n) for t, n in pares.T]).reshape(-1, 2)
+    tep, final = valores[inversa.ravel()].T
+    return tep.reshape(tea.shape), final.reshape(tea.shape)
+
+def info_cache_factores():
+    """Aciertos, fallos y tamaño de cada caché de factores (para dimensionarlas)."""
+    return {"factores": _factores_tasa.cache_info(), "factor_final": _factor_final_tasa.cache_info()}
+
+def limpiar_cache_factores():
+    """Vacía las cachés de factores y reinicia sus contadores."""
+    _factores_tasa.cache_clear()
+    _factor_final_tasa.cache_clear()
+
 # ===================================================================
 # Módulo A: Crecimiento de cartera
 # ===================================================================
-def calcular_crecimiento_cartera(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios):
-    """Calcula el crecimiento de la cartera período a período."""
+def _factor_aportes(factores, tasa_periodica, periodos):
+    """Factor de acumulación de los aportes tras `periodos` períodos.
+
+    El primer período no recibe aporte; desde el segundo, cada aporte
+    capitaliza un período menos que el monto inicial. Admite arreglos
+    (tasas nulas incluidas, resueltas por máscara).
+    """
+    tasa_periodica = np.asarray(tasa_periodica, dtype=float)
+    con_tasa = tasa_periodica > 0
+    divisor = np.where(con_tasa, tasa_periodica, 1.0)
+    return np.where(
+        con_tasa,
+        (factores / (1 + tasa_periodica) - 1) / divisor,
+        np.asarray(periodos, dtype=float) - 1
+    )
+
+def _periodos_por_anio(frecuencias):
+    """Períodos por año para un arreglo de nombres de frecuencia.
+
+    Agrupa las frecuencias para buscar en FRECUENCIAS una vez por grupo, no
+    por fila.
+    """
+    frecuencias = np.asarray(frecuencias, dtype=object)
+    grupo, nombres = pd.factorize(frecuencias.ravel())
+    if any(nombre not in FRECUENCIAS for nombre in nombres):
+        raise ValueError("Frecuencia no válida")
+    return np.array([FRECUENCIAS[nombre] for nombre in nombres])[grupo].reshape(frecuencias.shape)
+
+def _capital_final_cerrado(monto_inicial, aporte_periodico, tasa_periodica, n_periodos_total):
+    """Saldo final tras n períodos por fórmula cerrada (anualidad), en O(1)."""
+    factor = (1 + tasa_periodica) ** n_periodos_total
+    return monto_inicial * factor + aporte_periodico * _factor_aportes(factor, tasa_periodica, n_periodos_total)
+
+def validar_crecimiento(monto_inicial, aporte_periodico, tasa_anual, plazo_anios):
+    """Valida los parámetros del Módulo A (escalares o arreglos, un plazo común).
+
+    La usan las variantes por lote, en centavos y Monte Carlo para rechazar
+    lo mismo que `calcular_crecimiento_cartera`.
+    """
+    if np.any(np.asarray(monto_inicial) < 0) or np.any(np.asarray(aporte_periodico) < 0):
+        raise ValueError("Montos no pueden ser negativos")
+    if np.any(np.asarray(tasa_anual) < 0) or np.any(np.asarray(tasa_anual) > 0.5):
+        raise ValueError("TEA debe estar entre 0% y 50%")
+    if plazo_anios < 1:
+        raise ValueError("Plazo debe ser ≥ 1 año")
+
+def calcular_crecimiento_cartera(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios,
+                                 detalle=True):
+    """Calcula el crecimiento de la cartera período a período.
+
+    Devuelve `(cronograma, capital_final, total_aportado)`; el cronograma es
+    un `Cronograma` (usar `.to_frame()` para obtener el DataFrame). Con
+    `detalle=False` no construye la tabla por período: devuelve
+    `(None, capital_final, total_aportado)` calculados por fórmula cerrada.
+    """
     # Validaciones
     if monto_inicial < 0 or aporte_periodico < 0:
         raise ValueError("Montos no pueden ser negativos")
@@ -38,98 +180,1422 @@ def calcular_crecimiento_cartera(monto_inicial, aporte_periodico, frecuencia_apo
 
     n_periodos_por_anio = FRECUENCIAS[frecuencia_aporte]
     n_periodos_total = plazo_anios * n_periodos_por_anio
-    tasa_periodica = convertir_tea_a_tep(tasa_anual, frecuencia_aporte)
+    total_aportado = aporte_periodico * (n_periodos_total - 1) + monto_inicial
+
+    if not detalle:
+        tasa_periodica = convertir_tea_a_tep(tasa_anual, frecuencia_aporte)
+        capital_final = _capital_final_cerrado(monto_inicial, aporte_periodico, tasa_periodica, n_periodos_total)
+        return None, float(np.round(capital_final, 2)), total_aportado
+
+    # Factores de crecimiento acumulados (1 + TEP)^t para t = 1..n
+    tasa_periodica, factores, _ = obtener_factores_tasa(tasa_anual, frecuencia_aporte, n_periodos_total)
+    periodos = np.arange(1, n_periodos_total + 1)
+    factor_aportes = _factor_aportes(factores, tasa_periodica, periodos)
+
+    saldo_final = monto_inicial * factores + aporte_periodico * factor_aportes
+    saldo_inicial = np.concatenate(([monto_inicial], saldo_final[:-1]))
+    aportes = np.full(n_periodos_total, aporte_periodico, dtype=float)
+    aportes[0] = 0.0
+    interes_ganado = saldo_inicial * tasa_periodica
+
+    cronograma = Cronograma({
+        "Periodo": periodos,
+        "Saldo Inicial": np.round(saldo_inicial, 2),
+        "Aporte": np.round(aportes, 2),
+        "Interés Ganado": np.round(interes_ganado, 2),
+        "Saldo Final": np.round(saldo_final, 2)
+    })
+    capital_final = cronograma["Saldo Final"][-1]
+    return cronograma, capital_final, total_aportado
+
+def calcular_crecimiento_cartera_lote(monto_inicial, aporte_periodico=None, frecuencia_aporte=None,
+                                      tasa_anual=None, plazo_anios=None):
+    """Calcula capital final, total aportado y ganancia para muchos escenarios.
+
+    Cada parámetro puede ser un escalar o un arreglo (se hace broadcasting).
+    También acepta un DataFrame como primer argumento, con columnas
+    `monto_inicial`, `aporte_periodico`, `frecuencia_aporte`, `tasa_anual`
+    y `plazo_anios`. Las frecuencias mixtas se agrupan internamente.
+    """
+    if isinstance(monto_inicial, pd.DataFrame):
+        parametros = monto_inicial
+        monto_inicial = parametros["monto_inicial"].to_numpy()
+        aporte_periodico = parametros["aporte_periodico"].to_numpy()
+        frecuencia_aporte = parametros["frecuencia_aporte"].to_numpy()
+        tasa_anual = parametros["tasa_anual"].to_numpy()
+        plazo_anios = parametros["plazo_anios"].to_numpy()
+
+    monto, aporte, tasa, plazo = np.broadcast_arrays(
+        np.asarray(monto_inicial, dtype=float),
+        np.asarray(aporte_periodico, dtype=float),
+        np.asarray(tasa_anual, dtype=float),
+        np.asarray(plazo_anios, dtype=float)
+    )
+    frecuencias = np.broadcast_to(np.asarray(frecuencia_aporte, dtype=object), monto.shape)
+
+    # Validaciones
+    if np.any(monto < 0) or np.any(aporte < 0):
+        raise ValueError("Montos no pueden ser negativos")
+    if np.any(tasa < 0) or np.any(tasa > 0.5):
+        raise ValueError("TEA debe estar entre 0% y 50%")
+    if np.any(plazo < 1):
+        raise ValueError("Plazo debe ser ≥ 1 año")
+
+    n_periodos_por_anio = _periodos_por_anio(frecuencias)
+
+    n_periodos_total = plazo * n_periodos_por_anio
+    tasa_periodica = (1 + tasa) ** (1 / n_periodos_por_anio) - 1
+    capital_final = np.round(_capital_final_cerrado(monto, aporte, tasa_periodica, n_periodos_total), 2)
+    total_aportado = monto + aporte * (n_periodos_total - 1)
+
+    return pd.DataFrame({
+        "Capital Final": capital_final.ravel(),
+        "Total Aportado": total_aportado.ravel(),
+        "Ganancia": (capital_final - total_aportado).ravel()
+    })
+
+# --- Cronogramas largos por bloques ---
+# Períodos por bloque: 50 años diarios (~18k períodos) caben en 5 bloques
+TAMANO_BLOQUE_CRONOGRAMA = 4096
+
+def iterar_cronograma_crecimiento(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios,
+                                  tamano_bloque=TAMANO_BLOQUE_CRONOGRAMA):
+    """Genera el cronograma de `calcular_crecimiento_cartera` por bloques.
+
+    Cada bloque es un `Cronograma` de hasta `tamano_bloque` períodos con
+    los mismos valores que la versión completa, calculados por fórmula
+    cerrada sin arrastrar estado entre bloques. La memoria depende del
+    bloque, no del horizonte. Ver `exportar_cronograma_bloques`.
+    """
+    validar_crecimiento(monto_inicial, aporte_periodico, tasa_anual, plazo_anios)
+    if tamano_bloque < 1:
+        raise ValueError("El bloque debe tener al menos un período")
 
-    data = []
-    saldo_inicial = monto_inicial
-    total_aportado = 0
-
-    for periodo in range(1, n_periodos_total + 1):
-        aporte_actual = aporte_periodico if periodo > 1 else 0
-        saldo_con_aporte = saldo_inicial + aporte_actual
-        interes_ganado = saldo_inicial * tasa_periodica
-        saldo_final = saldo_con_aporte + interes_ganado
-
-        data.append({
-            "Periodo": periodo,
-            "Saldo Inicial": round(saldo_inicial,2),
-            "Aporte": round(aporte_actual,2),
-            "Interés Ganado": round(interes_ganado,2),
-            "Saldo Final": round(saldo_final,2)
+    n_periodos_total = int(plazo_anios * FRECUENCIAS[frecuencia_aporte])
+    tasa_periodica = convertir_tea_a_tep(tasa_anual, frecuencia_aporte)
+    for inicio in range(1, n_periodos_total + 1, tamano_bloque):
+        # Se incluye el período anterior para obtener el saldo inicial del bloque
+        periodos = np.arange(inicio - 1, min(inicio + tamano_bloque, n_periodos_total + 1))
+        factores = (1 + tasa_periodica) ** periodos
+        saldo = monto_inicial * factores + aporte_periodico * _factor_aportes(factores, tasa_periodica, periodos)
+        if inicio == 1:
+            saldo[0] = monto_inicial
+        aportes = np.full(periodos.size - 1, aporte_periodico, dtype=float)
+        if inicio == 1:
+            aportes[0] = 0.0
+        yield Cronograma({
+            "Periodo": periodos[1:],
+            "Saldo Inicial": np.round(saldo[:-1], 2),
+            "Aporte": np.round(aportes, 2),
+            "Interés Ganado": np.round(saldo[:-1] * tasa_periodica, 2),
+            "Saldo Final": np.round(saldo[1:], 2)
         })
 
-        saldo_inicial = saldo_final
-        total_aportado += aporte_actual
+def exportar_cronograma_bloques(bloques, ruta, formato=None):
+    """Escribe bloques de `Cronograma` a CSV o Parquet a medida que llegan.
+
+    El formato se deduce de la extensión (".csv" o ".parquet") si no se
+    indica. Parquet requiere `pyarrow`. Devuelve la cantidad de filas
+    escritas.
+    """
+    formato = formato or os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in ("csv", "parquet"):
+        raise ValueError("Formato no válido: use csv o parquet")
 
-    df = pd.DataFrame(data)
-    capital_final = df["Saldo Final"].iloc[-1]
-    return df, capital_final, total_aportado + monto_inicial
+    filas = 0
+    if formato == "csv":
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            for i, bloque in enumerate(bloques):
+                bloque.to_frame().to_csv(archivo, header=i == 0, index=False)
+                filas += len(bloque)
+        return filas
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Para exportar a Parquet instale pyarrow") from error
+    escritor = None
+    try:
+        for bloque in bloques:
+            tabla = pa.Table.from_pandas(bloque.to_frame(), preserve_index=False)
+            if escritor is None:
+                escritor = pq.ParquetWriter(ruta, tabla.schema)
+            escritor.write_table(tabla)
+            filas += len(bloque)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return filas
 
 # ===================================================================
 # Módulo B: Jubilación
 # ===================================================================
+# --- Regímenes de impuesto sobre la ganancia de capital ---
+# "tramos": (límite inferior de la ganancia gravada, tasa marginal), en orden
+# creciente; "exento": ganancia mínima no gravada.
+REGIMENES_IMPUESTO = {
+    "Fuente Extranjera": {"descripcion": "29.5% (Fuente Extranjera)", "tramos": ((0.0, 0.295),), "exento": 0.0},
+    "Bolsa Local": {"descripcion": "5% (Bolsa Local)", "tramos": ((0.0, 0.05),), "exento": 0.0}
+}
+
+def _resolver_regimen(regimen):
+    """Normaliza un régimen a una lista `[(peso, limites, tasas, cuotas, exento)]`.
+
+    `regimen` puede ser una tasa plana, el nombre de un régimen de
+    `REGIMENES_IMPUESTO`, un dict con "tramos" (y opcionalmente "exento") o
+    una mezcla `{régimen: proporción de la ganancia}`, p. ej.
+    `{"Fuente Extranjera": 0.6, "Bolsa Local": 0.4}`.
+    """
+    if isinstance(regimen, str):
+        if regimen not in REGIMENES_IMPUESTO:
+            raise ValueError("Régimen de impuesto no válido")
+        regimen = REGIMENES_IMPUESTO[regimen]
+    if isinstance(regimen, dict) and "tramos" not in regimen:
+        pesos = np.array(list(regimen.values()), dtype=float)
+        if np.any(pesos < 0) or not np.isclose(pesos.sum(), 1.0):
+            raise ValueError("Las proporciones del régimen mixto deben sumar 1")
+        return [
+            (peso, *componente[1:])
+            for sub, peso in zip(regimen, pesos)
+            for componente in _resolver_regimen(sub)
+        ]
+    if not isinstance(regimen, dict):
+        regimen = {"tramos": ((0.0, float(regimen)),)}
+
+    limites, tasas = (np.array(columna, dtype=float) for columna in zip(*regimen["tramos"]))
+    if limites[0] != 0 or np.any(np.diff(limites) <= 0):
+        raise ValueError("Los tramos deben empezar en 0 y ser crecientes")
+    if np.any(tasas < 0) or np.any(tasas > 1):
+        raise ValueError("Las tasas de impuesto deben estar entre 0% y 100%")
+    # Impuesto acumulado al inicio de cada tramo
+    cuotas = np.concatenate(([0.0], np.cumsum(np.diff(limites) * tasas[:-1])))
+    return [(1.0, limites, tasas, cuotas, float(regimen.get("exento", 0.0)))]
+
+def calcular_impuesto_ganancia(ganancia, regimen):
+    """Impuesto sobre arreglos de ganancias (tramos progresivos, exento y mezclas).
+
+    El tramo de cada ganancia se ubica con `searchsorted`, sin bucles por
+    valor; las ganancias no positivas no pagan impuesto. Un arreglo de
+    tasas planas se aplica elemento a elemento (una tasa por ganancia).
+    """
+    ganancia = np.asarray(ganancia, dtype=float)
+    if not isinstance(regimen, (str, dict)) and np.ndim(regimen) > 0:
+        tasas = np.asarray(regimen, dtype=float)
+        if np.any(tasas < 0) or np.any(tasas > 1):
+            raise ValueError("Las tasas de impuesto deben estar entre 0% y 100%")
+        return np.maximum(ganancia, 0.0) * tasas
+    impuesto = np.zeros(ganancia.shape)
+    for peso, limites, tasas, cuotas, exento in _resolver_regimen(regimen):
+        gravada = np.maximum(ganancia * peso - exento, 0.0)
+        tramo = np.searchsorted(limites, gravada, side="right") - 1
+        impuesto += cuotas[tramo] + (gravada - limites[tramo]) * tasas[tramo]
+    return impuesto
+
 def calcular_impuestos(capital_final, total_aportado, tasa_impuesto):
-    """Calcula impuesto sobre ganancia de capital."""
-    ganancia = capital_final - total_aportado
-    if ganancia <= 0:
-        return 0.0, capital_final
-    impuesto = ganancia * tasa_impuesto
-    capital_neto = capital_final - impuesto
-    return round(impuesto,2), round(capital_neto,2)
+    """Calcula impuesto sobre ganancia de capital.
+
+    `tasa_impuesto` es una tasa plana o un régimen (ver `_resolver_regimen`).
+    Acepta escalares o arreglos de capitales finales. Impuesto y capital
+    neto se redondean por separado a partir del impuesto sin redondear.
+    """
+    capital_final = np.asarray(capital_final, dtype=float)
+    ganancia = capital_final - np.asarray(total_aportado, dtype=float)
+    impuesto_bruto = calcular_impuesto_ganancia(ganancia, tasa_impuesto)
+    impuesto = np.round(impuesto_bruto, 2)
+    capital_neto = np.where(ganancia > 0, np.round(capital_final - impuesto_bruto, 2), capital_final)
+    if capital_neto.ndim == 0:
+        return float(impuesto), float(capital_neto)
+    return impuesto, capital_neto
 
 def calcular_pension_mensual(capital_neto, tasa_anual_retiro, anios_pension, factor=1.0):
     """Calcula pensión mensual usando TEA → TEM y opcional factor (%)."""
+    n_meses = anios_pension * 12
+    if n_meses < 1:
+        raise ValueError("El horizonte de pensión debe ser de al menos un mes")
     if capital_neto <= 0:
         return 0.0
-    tasa_mensual = convertir_tea_a_tep(tasa_anual_retiro, "Mensual")
-    n_meses = anios_pension * 12
+    tasa_mensual, factor_capital = obtener_factor_final(tasa_anual_retiro, "Mensual", n_meses)
     if tasa_mensual == 0:
         return round(capital_neto * factor / n_meses,2)
-    pension = npf.pmt(rate=tasa_mensual, nper=n_meses, pv=-capital_neto, fv=0)
-    return round(pension * factor,2)
+    # Misma fórmula que npf.pmt, con (1 + TEM)^n de la caché (admite meses no enteros)
+    pension = capital_neto * factor_capital * tasa_mensual / (factor_capital - 1)
+    return round(float(pension) * factor,2)
+
+def _pension_mensual_vectorizada(capital_neto, tasa_anual_retiro, anios_pension, factor=1.0):
+    """Pensión mensual (sin redondear) para arreglos de capital, tasas y plazos.
+
+    Misma fórmula que `npf.pmt`, con los factores de `_factores_finales_lote`;
+    las celdas con tasa cero se resuelven por máscara en lugar de ramificar.
+    """
+    capital_neto = np.asarray(capital_neto, dtype=float)
+    tasa_anual_retiro = np.asarray(tasa_anual_retiro, dtype=float)
+    if np.any(tasa_anual_retiro < 0):
+        raise ValueError("La TEA no puede ser negativa")
+    n_meses = np.asarray(anios_pension, dtype=float) * 12
+    if np.any(n_meses < 1):
+        raise ValueError("El horizonte de pensión debe ser de al menos un mes")
+    tasa_mensual, factor_capital = _factores_finales_lote(tasa_anual_retiro, "Mensual", n_meses)
+
+    con_tasa = tasa_mensual > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pension = np.where(
+            con_tasa,
+            capital_neto * factor_capital * tasa_mensual / (factor_capital - 1),
+            capital_neto / n_meses
+        )
+    return np.where(capital_neto > 0, pension * factor, 0.0)
+
+def calcular_pension_mensual_lote(capital_neto, tasa_anual_retiro, anios_pension, factor=1.0):
+    """Calcula la pensión mensual (redondeada) para muchos escenarios a la vez.
+
+    Cada parámetro puede ser un escalar o un arreglo (se hace broadcasting);
+    devuelve un arreglo con la forma combinada de todos ellos.
+    """
+    forma = np.broadcast_shapes(*map(np.shape, (capital_neto, tasa_anual_retiro, anios_pension, factor)))
+    pension = _pension_mensual_vectorizada(capital_neto, tasa_anual_retiro, anios_pension, factor)
+    return np.round(np.broadcast_to(pension, forma), 2)
 
 # Permite escenarios múltiples
-def calcular_escenarios_jubilacion(capital_neto, tasas_retiro, edades_pension):
-    """Devuelve DataFrame con pensión mensual para distintos escenarios."""
-    resultados = []
-    for tasa in tasas_retiro:
-        for edad in edades_pension:
-            anios_pension = edad
-            pension = calcular_pension_mensual(capital_neto, tasa, anios_pension)
-            resultados.append({
-                "Tasa TEA Retiro (%)": tasa*100,
-                "Años de Pensión": anios_pension,
-                "Pensión Mensual (USD)": pension
-            })
-    return pd.DataFrame(resultados)
+def calcular_escenarios_jubilacion(capital_neto, tasas_retiro, edades_pension, formato="largo"):
+    """Devuelve DataFrame con pensión mensual para distintos escenarios.
+
+    La grilla tasas × años se calcula en un solo paso vectorizado. Con
+    `formato="ancho"` devuelve la tabla pivotada (filas: tasa, columnas:
+    años de pensión), útil para mapas de calor.
+    """
+    if formato not in ("largo", "ancho"):
+        raise ValueError("Formato no válido")
+    tasas = np.asarray(tasas_retiro, dtype=float).ravel()
+    anios = np.asarray(edades_pension).ravel()
+    pensiones = np.round(_pension_mensual_vectorizada(capital_neto, tasas[:, None], anios[None, :]), 2)
+
+    if formato == "ancho":
+        return pd.DataFrame(
+            pensiones,
+            index=pd.Index(tasas * 100, name="Tasa TEA Retiro (%)"),
+            columns=pd.Index(anios, name="Años de Pensión")
+        )
+    return pd.DataFrame({
+        "Tasa TEA Retiro (%)": np.repeat(tasas * 100, anios.size),
+        "Años de Pensión": np.tile(anios, tasas.size),
+        "Pensión Mensual (USD)": pensiones.ravel()
+    })
+
+def _meses_retiro(anios_pension):
+    """Meses de retiro de los cronogramas mes a mes: el horizonte al mes más cercano."""
+    n_meses = np.rint(np.asarray(anios_pension, dtype=float) * 12).astype(int)
+    if np.any(n_meses < 1):
+        raise ValueError("El horizonte de pensión debe ser de al menos un mes")
+    return n_meses
+
+def calcular_cronograma_retiro(capital_neto, tasa_anual_retiro, anios_pension, factor=1.0):
+    """Cronograma mensual de la etapa de retiro (desacumulación).
+
+    Cada mes el saldo gana interés a la TEM y se retira la pensión de
+    `calcular_pension_mensual` (pagos a fin de mes), calculada para los
+    meses de `_meses_retiro`: con `factor=1` el saldo termina en cero y con
+    `factor < 1` queda un remanente. Se calcula por fórmula cerrada para
+    todos los meses a la vez y se devuelve como `Cronograma`.
+    """
+    if capital_neto < 0:
+        raise ValueError("Montos no pueden ser negativos")
+    n_meses = int(_meses_retiro(anios_pension))
+    tasa_mensual, crecimiento, _ = obtener_factores_tasa(tasa_anual_retiro, "Mensual", n_meses)
+    pension = float(_pension_mensual_vectorizada(capital_neto, tasa_anual_retiro, n_meses / 12, factor))
+
+    meses = np.arange(1, n_meses + 1)
+    saldo_final = capital_neto * crecimiento - pension * _factor_aportes(crecimiento * (1 + tasa_mensual),
+                                                                          tasa_mensual, meses + 1)
+    saldo_inicial = np.concatenate(([capital_neto], saldo_final[:-1]))
+    return Cronograma({
+        "Periodo": meses,
+        "Saldo Inicial": np.round(saldo_inicial, 2),
+        "Interés Ganado": np.round(saldo_inicial * tasa_mensual, 2),
+        "Retiro": np.round(np.full(n_meses, pension), 2),
+        "Saldo Final": np.round(saldo_final, 2) + 0.0  # evita -0.0 en el último mes
+    })
+
+# ===================================================================
+# Renta vitalicia (tablas de mortalidad)
+# ===================================================================
+# Tabla ilustrativa (Gompertz-Makeham) con columnas edad, sexo y qx;
+# reemplazar por la tabla oficial que corresponda.
+RUTA_TABLA_MORTALIDAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabla_mortalidad.csv")
+
+@lru_cache(maxsize=4)
+def _curvas_supervivencia(ruta):
+    """Lee la tabla una sola vez y arma, por sexo, la supervivencia mensual.
+
+    Devuelve `{sexo: (edad_minima, supervivencia)}`, donde `supervivencia[j]`
+    es la proporción de sobrevivientes a la edad `edad_minima + j / 12`,
+    interpolada linealmente dentro de cada año (distribución uniforme de
+    muertes).
+    """
+    tabla = pd.read_csv(ruta)
+    if not {"edad", "sexo", "qx"} <= set(tabla.columns):
+        raise ValueError("La tabla de mortalidad debe tener columnas edad, sexo y qx")
+    curvas = {}
+    for sexo, grupo in tabla.sort_values("edad").groupby("sexo"):
+        edades = grupo["edad"].to_numpy(dtype=np.int64)
+        if np.any(np.diff(edades) != 1):
+            raise ValueError("La tabla de mortalidad debe tener edades consecutivas")
+        qx = np.clip(grupo["qx"].to_numpy(dtype=float), 0.0, 1.0)
+        qx[-1] = 1.0  # nadie sobrevive a la última edad de la tabla
+        lx = np.concatenate(([1.0], np.cumprod(1 - qx)))
+        supervivencia = np.interp(np.arange(lx.size * 12 - 11) / 12, np.arange(lx.size), lx)
+        supervivencia.setflags(write=False)
+        curvas[str(sexo)] = (int(edades[0]), supervivencia)
+    return curvas
+
+def _supervivencia(sexo, ruta):
+    curvas = _curvas_supervivencia(ruta)
+    if sexo not in curvas:
+        raise ValueError(f"Sexo no válido: use {', '.join(sorted(curvas))}")
+    return curvas[sexo]
+
+def calcular_factores_renta_vitalicia(edades, tasas_retiro, sexo, ruta=RUTA_TABLA_MORTALIDAD):
+    """Valor presente de 1 USD mensual vitalicio para la grilla edades × tasas.
+
+    Pagos a fin de mes ponderados por la probabilidad de estar vivo. Las
+    probabilidades de supervivencia (edades × meses) se multiplican por los
+    factores de descuento (meses × tasas) en un solo producto matricial.
+    """
+    edad_minima, supervivencia = _supervivencia(sexo, ruta)
+    edades = np.asarray(edades, dtype=np.int64).ravel()
+    tasas = np.asarray(tasas_retiro, dtype=float).ravel()
+    edad_maxima = edad_minima + (supervivencia.size - 1) // 12
+    if np.any(edades < edad_minima) or np.any(edades >= edad_maxima):
+        raise ValueError(f"La edad debe estar entre {edad_minima} y {edad_maxima - 1}")
+    if np.any(tasas < 0):
+        raise ValueError("La TEA no puede ser negativa")
+
+    # Supervivencia condicionada a la edad de inicio: fila e, mes k → l(x + k/12) / l(x)
+    n_meses = supervivencia.size - 1
+    inicios = (edades - edad_minima) * 12
+    con_ceros = np.concatenate((supervivencia[1:], np.zeros(n_meses)))
+    probabilidades = np.lib.stride_tricks.sliding_window_view(con_ceros, n_meses)[inicios]
+    probabilidades = probabilidades / supervivencia[inicios, None]
+
+    meses = np.arange(1, n_meses + 1)
+    descuento = (1 + tasas[None, :]) ** (-meses[:, None] / 12)
+    return probabilidades @ descuento
+
+def calcular_pension_vitalicia(capital_neto, tasa_anual_retiro, edad, sexo, factor=1.0,
+                               ruta=RUTA_TABLA_MORTALIDAD):
+    """Pensión mensual vitalicia que se compra con el capital neto."""
+    if capital_neto <= 0:
+        return 0.0
+    renta = calcular_factores_renta_vitalicia(edad, tasa_anual_retiro, sexo, ruta)[0, 0]
+    return round(float(capital_neto / renta) * factor, 2)
+
+def calcular_escenarios_jubilacion_vitalicia(capital_neto, tasas_retiro, edades_retiro, sexo, formato="largo",
+                                             ruta=RUTA_TABLA_MORTALIDAD):
+    """Como `calcular_escenarios_jubilacion`, pero con renta vitalicia por edad.
+
+    Filas: tasa de retiro; columnas (formato ancho): edad al jubilarse.
+    """
+    if formato not in ("largo", "ancho"):
+        raise ValueError("Formato no válido")
+    tasas = np.asarray(tasas_retiro, dtype=float).ravel()
+    edades = np.asarray(edades_retiro, dtype=np.int64).ravel()
+    rentas = calcular_factores_renta_vitalicia(edades, tasas, sexo, ruta).T
+    pensiones = np.round(np.where(capital_neto > 0, capital_neto / rentas, 0.0), 2)
+
+    if formato == "ancho":
+        return pd.DataFrame(
+            pensiones,
+            index=pd.Index(tasas * 100, name="Tasa TEA Retiro (%)"),
+            columns=pd.Index(edades, name="Edad de Retiro")
+        )
+    return pd.DataFrame({
+        "Tasa TEA Retiro (%)": np.repeat(tasas * 100, edades.size),
+        "Edad de Retiro": np.tile(edades, tasas.size),
+        "Pensión Mensual (USD)": pensiones.ravel()
+    })
 
 # ===================================================================
 # Módulo C: Valoración de bonos
 # ===================================================================
+def _descontar_flujos(flujos, frecuencia_pago, tasa_retorno_anual):
+    """Descuenta el cronograma de `generar_flujos_bono` con los factores de la caché."""
+    if tasa_retorno_anual < 0:
+        raise ValueError("Valores no pueden ser negativos")
+    _, _, factores_descuento = obtener_factores_tasa(tasa_retorno_anual, frecuencia_pago, len(flujos))
+    pv_flujos = flujos["Flujo Total"] * factores_descuento
+    pv_total = pv_flujos.sum()
+
+    flujos_bono = Cronograma({
+        "Periodo": flujos["Periodo"],
+        "Saldo Capital": np.round(flujos["Saldo Capital"], 2),
+        "Cupón": np.round(flujos["Cupón"], 2),
+        "Amortización": np.round(flujos["Amortización"], 2),
+        "Flujo (Cupón)": np.round(flujos["Flujo Total"], 2),
+        "Flujo Descontado (PV)": np.round(pv_flujos, 2)
+    })
+    return round(float(pv_total),2), flujos_bono
+
 def calcular_pv_bono(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, tasa_retorno_anual):
-    """Calcula PV de un bono con desglose por periodo."""
+    """Calcula PV de un bono con desglose por periodo (como `Cronograma`)."""
     if valor_nominal < 0 or tasa_cupon_anual < 0 or tasa_retorno_anual < 0:
         raise ValueError("Valores no pueden ser negativos")
+    pv_total, flujos = calcular_pv_bono_estructurado(valor_nominal, frecuencia_pago, plazo_anios,
+                                                     tasa_retorno_anual, tasa_cupon_anual)
+    flujos_bono = Cronograma({
+        nombre: flujos[nombre] for nombre in ("Periodo", "Flujo (Cupón)", "Flujo Descontado (PV)")
+    })
+    return pv_total, flujos_bono
+
+def _flujos_bonos(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, *otros):
+    """Matriz de flujos bonos × períodos, rellenada hasta el vencimiento más largo.
+
+    Devuelve `(flujos, periodos, vigente, n_periodos_por_anio, forma, otros)`,
+    donde `vigente` marca los períodos reales de cada bono y `otros` son los
+    arreglos adicionales recibidos, aplanados con el mismo broadcasting.
+    """
+    nominal, cupon_anual, plazo, *otros = np.broadcast_arrays(
+        np.asarray(valor_nominal, dtype=float),
+        np.asarray(tasa_cupon_anual, dtype=float),
+        np.asarray(plazo_anios, dtype=float),
+        *(np.asarray(x, dtype=float) for x in otros)
+    )
+    if np.any(nominal < 0) or np.any(cupon_anual < 0):
+        raise ValueError("Valores no pueden ser negativos")
+    forma = nominal.shape
+    nominal, cupon_anual, plazo = nominal.ravel(), cupon_anual.ravel(), plazo.ravel()
+    n_periodos_por_anio = _periodos_por_anio(
+        np.broadcast_to(np.asarray(frecuencia_pago, dtype=object), forma)
+    ).ravel()
+
+    n_periodos_total = np.rint(plazo * n_periodos_por_anio).astype(int)
+    if np.any(n_periodos_total < 1):
+        raise ValueError("Plazo debe tener al menos un período")
+    monto_cupon = nominal * cupon_anual / n_periodos_por_anio
+
+    periodos = np.arange(1, n_periodos_total.max() + 1)
+    vigente = periodos[None, :] <= n_periodos_total[:, None]
+    flujos = np.where(vigente, monto_cupon[:, None], 0.0)
+    flujos[np.arange(nominal.size), n_periodos_total - 1] += nominal
+    return flujos, periodos, vigente, n_periodos_por_anio, forma, [x.ravel() for x in otros]
+
+def _metricas_descuento(flujos, periodos, tasa_periodica):
+    """PV, derivada, duración y convexidad (en períodos) en una sola pasada.
+
+    Reutiliza los mismos flujos descontados para las cuatro medidas.
+    """
+    pv_flujos = flujos / (1 + tasa_periodica[:, None]) ** periodos[None, :]
+    pv = pv_flujos.sum(axis=1)
+    momento_1 = pv_flujos @ periodos
+    momento_2 = pv_flujos @ (periodos * (periodos + 1.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        duracion = momento_1 / pv
+        convexidad = momento_2 / (pv * (1 + tasa_periodica) ** 2)
+    derivada = -momento_1 / (1 + tasa_periodica)
+    return pv_flujos, pv, derivada, duracion, convexidad
+
+def _tabla_analitica(pv, duracion, convexidad, tasa_periodica, n_periodos_por_anio, forma):
+    """Arma la tabla de analítica de bonos con duración y convexidad en años."""
+    duracion_anios = duracion / n_periodos_por_anio
+    return pd.DataFrame({
+        "Valor Presente (PV)": np.round(pv, 2).reshape(-1),
+        "Duración Macaulay (años)": duracion_anios.reshape(-1),
+        "Duración Modificada": (duracion_anios / (1 + tasa_periodica)).reshape(-1),
+        "Convexidad": (convexidad / n_periodos_por_anio ** 2).reshape(-1)
+    })
+
+def calcular_pv_bonos_lote(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, tasa_retorno_anual,
+                           detalle=False):
+    """Calcula el PV de muchos bonos a la vez (API columnar).
+
+    Cada parámetro puede ser un escalar o un arreglo (se hace broadcasting).
+    Los vencimientos distintos se igualan con relleno y una máscara de
+    períodos vigentes. Devuelve un arreglo de PV; con `detalle=True`
+    devuelve `(pv, df_flujos)` con los flujos de todos los bonos en formato
+    largo (columna "Bono" con el índice de cada uno).
+    """
+    flujos, periodos, vigente, n_periodos_por_anio, forma, (rendimiento,) = _flujos_bonos(
+        valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, tasa_retorno_anual
+    )
+    if np.any(rendimiento < 0):
+        raise ValueError("Valores no pueden ser negativos")
+    tasa_retorno_periodica = (1 + rendimiento) ** (1 / n_periodos_por_anio) - 1
+    pv_flujos = flujos / (1 + tasa_retorno_periodica[:, None]) ** periodos[None, :]
+    pv = np.round(pv_flujos.sum(axis=1), 2).reshape(forma)
+
+    if not detalle:
+        return pv
+    bono, columna = np.nonzero(vigente)
+    df_flujos = pd.DataFrame({
+        "Bono": bono,
+        "Periodo": periodos[columna],
+        "Flujo (Cupón)": np.round(flujos[vigente], 2),
+        "Flujo Descontado (PV)": np.round(pv_flujos[vigente], 2)
+    })
+    return pv, df_flujos
+
+def calcular_analitica_bonos(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, tasa_retorno_anual):
+    """Calcula PV, duración Macaulay/modificada y convexidad de muchos bonos.
+
+    Todas las medidas salen de la misma pasada sobre los flujos descontados.
+    La duración se expresa en años y la convexidad en años².
+    """
+    flujos, periodos, _, n_periodos_por_anio, forma, (rendimiento,) = _flujos_bonos(
+        valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, tasa_retorno_anual
+    )
+    if np.any(rendimiento < 0):
+        raise ValueError("Valores no pueden ser negativos")
+    tasa_periodica = (1 + rendimiento) ** (1 / n_periodos_por_anio) - 1
+    _, pv, _, duracion, convexidad = _metricas_descuento(flujos, periodos, tasa_periodica)
+    return _tabla_analitica(pv, duracion, convexidad, tasa_periodica, n_periodos_por_anio, forma)
+
+def calcular_ytm_bonos(precio, valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios,
+                       tolerancia=1e-10, max_iteraciones=100):
+    """Calcula el rendimiento al vencimiento (YTM, como TEA) de muchos bonos.
+
+    Newton vectorizado sobre la tasa periódica, protegido por un intervalo
+    que se achica en cada iteración: si el paso de Newton sale del
+    intervalo se usa bisección. Todos los bonos iteran a la vez y se
+    congelan al converger. Devuelve también duración y convexidad, que
+    salen de la última pasada de descuento. Los bonos sin solución
+    (precio ≤ 0 o fuera de rango) quedan con NaN.
+    """
+    flujos, periodos, vigente, n_periodos_por_anio, forma, (precio,) = _flujos_bonos(
+        valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, precio
+    )
+    n_bonos = precio.size
+
+    # Intervalo inicial de la tasa periódica: el PV es decreciente en la tasa
+    inferior = np.full(n_bonos, -0.99)
+    superior = np.full(n_bonos, 1.0)
+    # Semilla: tasa que iguala el precio con la suma de flujos al vencimiento
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tasa = (flujos.sum(axis=1) / precio) ** (1 / vigente.sum(axis=1)) - 1
+    tasa = np.clip(np.nan_to_num(tasa), inferior + 1e-6, superior - 1e-6)
+
+    activos = precio > 0
+    for _ in range(max_iteraciones):
+        if not activos.any():
+            break
+        _, pv, derivada, _, _ = _metricas_descuento(flujos[activos], periodos, tasa[activos])
+        error = pv - precio[activos]
+        convergio = np.abs(error) <= tolerancia * precio[activos]
+
+        # El PV baja con la tasa: error > 0 significa tasa demasiado baja
+        idx = np.flatnonzero(activos)
+        inferior[idx] = np.where(error > 0, tasa[idx], inferior[idx])
+        superior[idx] = np.where(error < 0, tasa[idx], superior[idx])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = tasa[idx] - error / derivada
+        fuera = ~((newton > inferior[idx]) & (newton < superior[idx]))
+        siguiente = np.where(fuera, (inferior[idx] + superior[idx]) / 2, newton)
+        tasa[idx] = np.where(convergio, tasa[idx], siguiente)
+        activos[idx] = ~convergio & (superior[idx] - inferior[idx] > tolerancia)
+
+    # Última pasada: PV, duración y convexidad a la tasa encontrada
+    _, pv, _, duracion, convexidad = _metricas_descuento(flujos, periodos, tasa)
+    resuelto = (precio > 0) & np.isclose(pv, precio, rtol=1e-8)
+    tasa, pv, duracion, convexidad = (np.where(resuelto, x, np.nan) for x in (tasa, pv, duracion, convexidad))
+
+    tabla = _tabla_analitica(pv, duracion, convexidad, tasa, n_periodos_por_anio, forma)
+    tabla.insert(0, "YTM (TEA)", ((1 + tasa) ** n_periodos_por_anio - 1).reshape(-1))
+    return tabla
+
+# --- Generadores de flujos: amortizables, step-up y flotantes ---
+AMORTIZACIONES = ("bullet", "lineal")
+
+@lru_cache(maxsize=256)
+def _generar_flujos(valor_nominal, n_periodos_total, n_periodos_por_anio, amortizacion, tasas_cupon):
+    """Flujos por período para unos términos dados (cacheados por términos).
+
+    `amortizacion` es "bullet", "lineal" o una tupla con la fracción del
+    nominal que se amortiza en cada período; `tasas_cupon` es la tupla de
+    tasas anuales del cupón de cada período. Devuelve los arreglos (solo
+    lectura) `(saldo_inicial, cupon, amortizacion, flujos)`.
+    """
+    if amortizacion == "bullet":
+        fracciones = np.zeros(n_periodos_total)
+        fracciones[-1] = 1.0
+    elif amortizacion == "lineal":
+        fracciones = np.full(n_periodos_total, 1.0 / n_periodos_total)
+    else:
+        fracciones = np.asarray(amortizacion, dtype=float)
+        if fracciones.size != n_periodos_total or np.any(fracciones < 0) or not np.isclose(fracciones.sum(), 1.0):
+            raise ValueError("La amortización debe tener una fracción por período y sumar 1")
+    amortizado = valor_nominal * fracciones
+    saldo_inicial = valor_nominal - np.concatenate(([0.0], np.cumsum(amortizado)[:-1]))
+    cupon = saldo_inicial * (np.asarray(tasas_cupon) / n_periodos_por_anio)
+    flujos = cupon + amortizado
+    for arreglo in (saldo_inicial, cupon, amortizado, flujos):
+        arreglo.setflags(write=False)
+    return saldo_inicial, cupon, amortizado, flujos
+
+def _tasas_cupon(n_periodos_total, n_periodos_por_anio, tasa_cupon_anual, escalones, tasas_referencia, spread):
+    """Tasa anual del cupón de cada período: fija, escalonada o flotante."""
+    if tasas_referencia is not None:
+        referencia = np.asarray(tasas_referencia, dtype=float).ravel()
+        if referencia.size == 1:
+            referencia = np.full(n_periodos_total, referencia[0])
+        elif referencia.size < n_periodos_total:
+            raise ValueError("Las tasas de referencia deben cubrir todos los períodos")
+        tasas = np.maximum(referencia[:n_periodos_total] + spread, 0.0)
+    elif escalones is not None:
+        # {año desde el que rige: tasa}; el primer escalón debe regir desde el año 0
+        desde = np.array(sorted(escalones), dtype=float)
+        if desde[0] != 0:
+            raise ValueError("El primer escalón debe empezar en el año 0")
+        niveles = np.array([escalones[d] for d in sorted(escalones)], dtype=float)
+        inicio_periodo = np.arange(n_periodos_total) / n_periodos_por_anio
+        tasas = niveles[np.searchsorted(desde, inicio_periodo, side="right") - 1]
+    else:
+        tasas = np.full(n_periodos_total, float(tasa_cupon_anual))
+    if np.any(tasas < 0):
+        raise ValueError("Valores no pueden ser negativos")
+    return tuple(tasas.tolist())
+
+def generar_flujos_bono(valor_nominal, frecuencia_pago, plazo_anios, tasa_cupon_anual=0.0, amortizacion="bullet",
+                        escalones=None, tasas_referencia=None, spread=0.0):
+    """Cronograma de flujos de un bono bullet, amortizable, step-up o flotante.
+
+    - `amortizacion`: "bullet", "lineal" (cuotas de capital iguales) o una
+      secuencia con la fracción del nominal amortizada en cada período.
+    - `escalones`: dict `{año desde: tasa cupón}` para cupones step-up.
+    - `tasas_referencia` y `spread`: cupón flotante, con una tasa anual de
+      referencia por período (o una sola) más el spread.
+
+    El cupón se calcula sobre el saldo de capital vigente al inicio del
+    período. Los flujos se cachean por términos, así revaluar el bono con
+    otra tasa de retorno no los vuelve a generar.
+    """
+    if valor_nominal < 0:
+        raise ValueError("Valores no pueden ser negativos")
     n_periodos_por_anio = FRECUENCIAS[frecuencia_pago]
-    n_periodos_total = plazo_anios * n_periodos_por_anio
-    tasa_cupon_periodica = tasa_cupon_anual / n_periodos_por_anio
-    monto_cupon = valor_nominal * tasa_cupon_periodica
-    tasa_retorno_periodica = convertir_tea_a_tep(tasa_retorno_anual, frecuencia_pago)
-
-    flujos = [monto_cupon] * n_periodos_total
-    flujos[-1] += valor_nominal
-    data_flujos = []
-    pv_total = 0
-
-    for t in range(1, n_periodos_total + 1):
-        flujo = flujos[t-1]
-        pv_flujo = flujo / (1 + tasa_retorno_periodica)**t
-        pv_total += pv_flujo
-        data_flujos.append({
-            "Periodo": t,
-            "Flujo (Cupón)": round(flujo,2),
-            "Flujo Descontado (PV)": round(pv_flujo,2)
-        })
+    n_periodos_total = int(round(plazo_anios * n_periodos_por_anio))
+    if n_periodos_total < 1:
+        raise ValueError("Plazo debe tener al menos un período")
+    if isinstance(amortizacion, str):
+        if amortizacion not in AMORTIZACIONES:
+            raise ValueError("Amortización no válida")
+    else:
+        amortizacion = tuple(np.asarray(amortizacion, dtype=float).tolist())
+    tasas = _tasas_cupon(n_periodos_total, n_periodos_por_anio, tasa_cupon_anual, escalones,
+                         tasas_referencia, spread)
+    saldo_inicial, cupon, amortizado, flujos = _generar_flujos(
+        float(valor_nominal), n_periodos_total, n_periodos_por_anio, amortizacion, tasas
+    )
+    return Cronograma({
+        "Periodo": np.arange(1, n_periodos_total + 1),
+        "Saldo Capital": saldo_inicial,
+        "Cupón": cupon,
+        "Amortización": amortizado,
+        "Flujo Total": flujos
+    })
+
+def calcular_pv_bono_estructurado(valor_nominal, frecuencia_pago, plazo_anios, tasa_retorno_anual,
+                                  tasa_cupon_anual=0.0, amortizacion="bullet", escalones=None,
+                                  tasas_referencia=None, spread=0.0):
+    """PV de un bono con flujos de `generar_flujos_bono`.
+
+    Usa el mismo descuento que `calcular_pv_bono` y devuelve
+    `(pv, cronograma)`, con el desglose de cupón y amortización además de
+    las columnas de `calcular_pv_bono`.
+    """
+    flujos = generar_flujos_bono(valor_nominal, frecuencia_pago, plazo_anios, tasa_cupon_anual, amortizacion,
+                                 escalones, tasas_referencia, spread)
+    return _descontar_flujos(flujos, frecuencia_pago, tasa_retorno_anual)
+
+# --- Curva cero (estructura temporal de tasas) ---
+def _normalizar_curva(curva):
+    """Convierte la curva a una clave hashable `(tenores, tasas)` ordenada por plazo.
+
+    Acepta un dict `{tenor_en_anios: tasa_cero_TEA}` o un par de secuencias
+    `(tenores, tasas)`.
+    """
+    if isinstance(curva, dict):
+        tenores, tasas = list(curva.keys()), list(curva.values())
+    else:
+        tenores, tasas = curva
+    tenores = np.asarray(tenores, dtype=float)
+    tasas = np.asarray(tasas, dtype=float)
+    if tenores.size == 0 or tenores.shape != tasas.shape:
+        raise ValueError("La curva debe tener la misma cantidad de tenores y tasas")
+    if np.any(tenores <= 0):
+        raise ValueError("Los tenores deben ser positivos")
+    orden = np.argsort(tenores)
+    return tuple(tenores[orden].tolist()), tuple(tasas[orden].tolist())
+
+@lru_cache(maxsize=128)
+def _factores_descuento_curva(tenores, tasas, n_periodos_por_anio, n_periodos):
+    """Factores de descuento por período para una curva y frecuencia (cacheados).
+
+    La tasa cero de cada fecha de pago se interpola linealmente entre
+    tenores (plana fuera del rango).
+    """
+    plazos = np.arange(1, n_periodos + 1) / n_periodos_por_anio
+    tasas_cero = np.interp(plazos, tenores, tasas)
+    factores = (1 + tasas_cero) ** -plazos
+    factores.setflags(write=False)
+    return factores
+
+def _descontar_con_curva(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, curva):
+    """Flujos y flujos descontados (bonos × períodos) contra una curva cero.
+
+    Los factores de descuento se calculan una vez por frecuencia (y quedan
+    en caché para la curva). Devuelve `(flujos, pv_flujos, periodos,
+    vigente, forma)`.
+    """
+    tenores, tasas = _normalizar_curva(curva)
+    flujos, periodos, vigente, n_periodos_por_anio, forma, _ = _flujos_bonos(
+        valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios
+    )
+    # El horizonte cacheado se redondea a potencia de 2 para que bonos con
+    # distinto vencimiento compartan la misma entrada de caché.
+    n_cache = 1 << (periodos.size - 1).bit_length()
+    pv_flujos = np.empty_like(flujos)
+    for m in np.unique(n_periodos_por_anio):
+        grupo = n_periodos_por_anio == m
+        factores = _factores_descuento_curva(tenores, tasas, int(m), n_cache)[:periodos.size]
+        pv_flujos[grupo] = flujos[grupo] * factores
+    return flujos, pv_flujos, periodos, vigente, forma
+
+def calcular_pv_bono_curva(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, curva):
+    """Calcula PV de un bono descontando cada flujo con una curva cero.
+
+    `curva` es un dict `{tenor_en_anios: tasa_cero_TEA}` o `(tenores, tasas)`.
+    Devuelve `(pv, flujos)` como `calcular_pv_bono`.
+    """
+    flujos, pv_flujos, periodos, vigente, _ = _descontar_con_curva(valor_nominal, tasa_cupon_anual,
+                                                                   frecuencia_pago, plazo_anios, curva)
+    return round(float(pv_flujos.sum()), 2), Cronograma({
+        "Periodo": periodos[vigente[0]],
+        "Flujo (Cupón)": np.round(flujos[vigente], 2),
+        "Flujo Descontado (PV)": np.round(pv_flujos[vigente], 2)
+    })
+
+def calcular_pv_bonos_curva_lote(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, curva,
+                                 detalle=False):
+    """Calcula el PV de muchos bonos contra una misma curva cero.
+
+    Cada bono solo hace un producto con los factores de descuento de la
+    curva. Mismo formato de salida que `calcular_pv_bonos_lote`.
+    """
+    flujos, pv_flujos, periodos, vigente, forma = _descontar_con_curva(valor_nominal, tasa_cupon_anual,
+                                                                       frecuencia_pago, plazo_anios, curva)
+    pv = np.round(pv_flujos.sum(axis=1), 2).reshape(forma)
+
+    if not detalle:
+        return pv
+    bono, columna = np.nonzero(vigente)
+    df_flujos = pd.DataFrame({
+        "Bono": bono,
+        "Periodo": periodos[columna],
+        "Flujo (Cupón)": np.round(flujos[vigente], 2),
+        "Flujo Descontado (PV)": np.round(pv_flujos[vigente], 2)
+    })
+    return pv, df_flujos
+
+# ===================================================================
+# Flujos irregulares con fechas (XNPV / XIRR)
+# ===================================================================
+# Convención de Excel: años = días desde el primer flujo de la serie / 365
+DIAS_POR_ANIO = 365.0
+
+def _preparar_flujos_irregulares(valores, fechas, inicios):
+    """Normaliza series de flujos guardadas como arreglos planos.
+
+    `valores` y `fechas` tienen un elemento por flujo; `inicios` es el
+    índice del primer flujo de cada serie (como en `np.add.reduceat`).
+    Con `inicios=None` todo es una sola serie. Devuelve
+    `(valores, anios, serie, inicios)`, donde `anios` es el tiempo de cada
+    flujo desde el primero de su serie y `serie` el número de serie de
+    cada flujo.
+    """
+    valores = np.asarray(valores, dtype=float).ravel()
+    fechas = np.ravel(fechas)
+    if fechas.dtype.kind != "M":
+        fechas = pd.to_datetime(fechas).to_numpy()
+    fechas = fechas.astype("datetime64[D]")
+    if valores.size == 0 or valores.size != fechas.size:
+        raise ValueError("Debe haber una fecha por cada flujo")
+    inicios = np.zeros(1, dtype=np.int64) if inicios is None else np.asarray(inicios, dtype=np.int64).ravel()
+    if inicios.size == 0 or inicios[0] != 0 or np.any(np.diff(inicios) <= 0) or inicios[-1] >= valores.size:
+        raise ValueError("Los inicios deben empezar en 0, ser crecientes y no dejar series vacías")
+
+    serie = np.repeat(np.arange(inicios.size), np.diff(np.append(inicios, valores.size)))
+    dias = (fechas - fechas[inicios][serie]).astype(np.int64)
+    return valores, dias / DIAS_POR_ANIO, serie, inicios
+
+def _xnpv_plano(tasa, valores, anios, serie, inicios):
+    """XNPV y su derivada respecto de la tasa, por serie."""
+    log_crecimiento = np.log1p(tasa)
+    descuento = valores * np.exp(-anios * log_crecimiento[serie])
+    pv = np.add.reduceat(descuento, inicios)
+    derivada = -np.add.reduceat(anios * descuento, inicios) / (1 + tasa)
+    return pv, derivada
+
+def calcular_xnpv(tasa_anual, valores, fechas, inicios=None):
+    """Valor presente neto de flujos con fechas irregulares (XNPV).
+
+    `tasa_anual` es una TEA común o una por serie. Con `inicios=None`
+    devuelve un float; si no, un arreglo con el XNPV de cada serie.
+    """
+    valores, anios, serie, inicios = _preparar_flujos_irregulares(valores, fechas, inicios)
+    tasa = np.broadcast_to(np.asarray(tasa_anual, dtype=float), inicios.shape)
+    if np.any(tasa <= -1):
+        raise ValueError("La tasa debe ser mayor a -100%")
+    pv, _ = _xnpv_plano(tasa, valores, anios, serie, inicios)
+    return float(pv[0]) if pv.size == 1 else pv
+
+def calcular_xirr(valores, fechas, inicios=None, tolerancia=1e-10, max_iteraciones=100):
+    """Tasa interna de retorno (TEA) de flujos con fechas irregulares (XIRR).
+
+    Resuelve todas las series a la vez con el mismo esquema que
+    `calcular_ytm_bonos`: Newton vectorizado protegido por un intervalo
+    con cambio de signo, y bisección cuando el paso de Newton sale del
+    intervalo. Las series sin cambio de signo en [-99%, 1000%] quedan con
+    NaN (p. ej. flujos todos del mismo signo).
+    """
+    valores, anios, serie, inicios = _preparar_flujos_irregulares(valores, fechas, inicios)
+    n_series = inicios.size
+    escala = np.add.reduceat(np.abs(valores), inicios)
+
+    inferior = np.full(n_series, -0.99)
+    superior = np.full(n_series, 10.0)
+    with np.errstate(over="ignore", invalid="ignore"):
+        pv_inferior, _ = _xnpv_plano(inferior, valores, anios, serie, inicios)
+        pv_superior, _ = _xnpv_plano(superior, valores, anios, serie, inicios)
+    signo_inferior = np.sign(pv_inferior)
+    resuelto = signo_inferior * np.sign(pv_superior) < 0
+    tasa = np.where(resuelto, 0.1, np.nan)
+
+    # Solo se iteran los flujos de las series que siguen activas
+    idx = np.flatnonzero(resuelto)
+    conteos = np.diff(np.append(inicios, valores.size))
+    mascara = np.repeat(resuelto, conteos)
+    valores, anios, conteos = valores[mascara], anios[mascara], conteos[idx]
+    for _ in range(max_iteraciones):
+        if idx.size == 0:
+            break
+        inicios = np.concatenate(([0], np.cumsum(conteos)[:-1]))
+        serie = np.repeat(np.arange(idx.size), conteos)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            pv, derivada = _xnpv_plano(tasa[idx], valores, anios, serie, inicios)
+            newton = tasa[idx] - pv / derivada
+        convergio = np.abs(pv) <= tolerancia * escala[idx]
+
+        # Se conserva el cambio de signo entre los extremos del intervalo
+        mismo_signo = np.sign(pv) == signo_inferior[idx]
+        inferior[idx] = np.where(mismo_signo, tasa[idx], inferior[idx])
+        superior[idx] = np.where(mismo_signo, superior[idx], tasa[idx])
+        fuera = ~((newton > inferior[idx]) & (newton < superior[idx]))
+        siguiente = np.where(fuera, (inferior[idx] + superior[idx]) / 2, newton)
+        tasa[idx] = np.where(convergio, tasa[idx], siguiente)
+
+        siguen = ~convergio & (superior[idx] - inferior[idx] > tolerancia)
+        if not siguen.all():
+            mascara = np.repeat(siguen, conteos)
+            valores, anios, conteos, idx = valores[mascara], anios[mascara], conteos[siguen], idx[siguen]
+
+    tasa = np.where(resuelto, tasa, np.nan)
+    return float(tasa[0]) if n_series == 1 else tasa
+
+# ===================================================================
+# Motor de punto fijo: montos en centavos enteros (int64)
+# ===================================================================
+# Cantidad de unidades mínimas por unidad monetaria (100 = centavos)
+ESCALA_CENTAVOS = 100
+
+# "mitad_par": redondeo bancario (half-even); "mitad_arriba": half-up
+REDONDEOS = ("mitad_par", "mitad_arriba")
+
+def redondear_entero(valores, redondeo="mitad_par"):
+    """Redondea un arreglo a enteros int64 con la política indicada."""
+    valores = np.asarray(valores, dtype=float)
+    if redondeo == "mitad_par":
+        return np.rint(valores).astype(np.int64)
+    if redondeo == "mitad_arriba":
+        return (np.sign(valores) * np.floor(np.abs(valores) + 0.5)).astype(np.int64)
+    raise ValueError("Política de redondeo no válida")
+
+def a_centavos(montos, redondeo="mitad_par", escala=ESCALA_CENTAVOS):
+    """Convierte montos en unidades monetarias a enteros en la escala indicada."""
+    return redondear_entero(np.asarray(montos, dtype=float) * escala, redondeo)
+
+def _crecimiento_centavos_escalar(monto_inicial, aporte_periodico, tasa_periodica, n_periodos, redondeo):
+    """Recursión de `_crecimiento_centavos` para una sola cartera, con escalares.
+
+    Mismas operaciones en float64 (y mismo redondeo) que la versión con
+    arreglos, sin el costo fijo de NumPy por período.
+    """
+    saldo = float(monto_inicial)
+    saldos_iniciales, intereses = [0.0] * n_periodos, [0.0] * n_periodos
+    for t in range(n_periodos):
+        saldos_iniciales[t] = saldo
+        interes = saldo * tasa_periodica
+        interes = float(round(interes)) if redondeo == "mitad_par" else float(math.floor(interes + 0.5))
+        intereses[t] = interes
+        saldo += interes
+        if t > 0:
+            saldo += aporte_periodico
+    return saldos_iniciales, intereses, saldo
+
+def _crecimiento_centavos(monto_inicial, aporte_periodico, tasa_periodica, n_periodos, redondeo, detalle=True):
+    """Recorre los períodos en enteros para muchas carteras a la vez.
+
+    El interés de cada período se redondea a la unidad mínima con la
+    política elegida, así saldo final = saldo inicial + aporte + interés
+    exactamente. Devuelve matrices carteras × períodos (int64) y el saldo
+    final de cada cartera; con `detalle=False` solo el saldo final, con
+    memoria proporcional a la cantidad de carteras.
+
+    Cada interés se redondea sobre el saldo ya redondeado, así que la
+    recursión no se vectoriza sobre períodos: se vectoriza sobre carteras
+    (el costo por período casi no depende de cuántas sean). Una sola
+    cartera va por `_crecimiento_centavos_escalar`.
+    """
+    if redondeo not in REDONDEOS:
+        raise ValueError("Política de redondeo no válida")
+    if np.size(monto_inicial) == 1 and np.size(aporte_periodico) == 1 and np.size(tasa_periodica) == 1:
+        saldos_iniciales, intereses, saldo = _crecimiento_centavos_escalar(
+            np.ravel(monto_inicial)[0], np.ravel(aporte_periodico)[0], np.ravel(tasa_periodica)[0],
+            n_periodos, redondeo
+        )
+        saldo = np.array([saldo]).astype(np.int64)
+        if not detalle:
+            return saldo
+        return (np.array([saldos_iniciales]).astype(np.int64), np.array([intereses]).astype(np.int64),
+                saldo)
+    # Los enteros se llevan en float64 (exactos hasta 2**53) para redondear
+    # en el lugar; se convierten a int64 una sola vez al final.
+    saldo = np.asarray(monto_inicial, dtype=float).copy()
+    aporte = np.broadcast_to(np.asarray(aporte_periodico, dtype=float), saldo.shape)
+    saldos_iniciales = np.empty((n_periodos if detalle else 1, saldo.size))
+    intereses = np.empty_like(saldos_iniciales)
+    for t in range(n_periodos):
+        fila = t if detalle else 0
+        saldos_iniciales[fila] = saldo
+        interes = intereses[fila]
+        np.multiply(saldo, tasa_periodica, out=interes)
+        if redondeo == "mitad_par":
+            np.rint(interes, out=interes)
+        else:
+            # Saldos y tasas no negativos: half-up = piso(x + 0.5)
+            interes += 0.5
+            np.floor(interes, out=interes)
+        saldo += interes
+        if t > 0:
+            saldo += aporte
+    if not detalle:
+        return saldo.astype(np.int64)
+    return (saldos_iniciales.T.astype(np.int64), intereses.T.astype(np.int64),
+            saldo.astype(np.int64))
+
+def calcular_crecimiento_cartera_centavos(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual,
+                                          plazo_anios, redondeo="mitad_par", escala=ESCALA_CENTAVOS):
+    """Como `calcular_crecimiento_cartera`, pero con saldos en centavos enteros.
+
+    Cada fila concilia al centavo (saldo final = saldo inicial + aporte +
+    interés) porque el saldo acumulado es el mismo valor redondeado que se
+    muestra. Devuelve `(cronograma, capital_final, total_aportado)` en
+    unidades monetarias.
+    """
+    validar_crecimiento(monto_inicial, aporte_periodico, tasa_anual, plazo_anios)
+    n_periodos_total = int(plazo_anios * FRECUENCIAS[frecuencia_aporte])
+    tasa_periodica = convertir_tea_a_tep(tasa_anual, frecuencia_aporte)
+
+    monto_c = a_centavos([monto_inicial], redondeo, escala)
+    aporte_c = a_centavos(aporte_periodico, redondeo, escala)
+    saldos_iniciales, intereses, _ = _crecimiento_centavos(monto_c, aporte_c, tasa_periodica,
+                                                           n_periodos_total, redondeo)
+    saldos_iniciales, intereses = saldos_iniciales[0], intereses[0]
+    aportes = np.full(n_periodos_total, aporte_c, dtype=np.int64)
+    aportes[0] = 0
+    saldos_finales = saldos_iniciales + aportes + intereses
+
+    cronograma = Cronograma({
+        "Periodo": np.arange(1, n_periodos_total + 1),
+        "Saldo Inicial": saldos_iniciales / escala,
+        "Aporte": aportes / escala,
+        "Interés Ganado": intereses / escala,
+        "Saldo Final": saldos_finales / escala
+    })
+    total_aportado = (monto_c[0] + aportes.sum()) / escala
+    return cronograma, saldos_finales[-1] / escala, total_aportado
+
+def calcular_crecimiento_cartera_centavos_lote(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual,
+                                               plazo_anios, redondeo="mitad_par", escala=ESCALA_CENTAVOS):
+    """Capital final y total aportado, en centavos int64, para muchas carteras.
+
+    `monto_inicial`, `aporte_periodico` y `tasa_anual` pueden ser arreglos
+    (broadcasting); frecuencia y plazo son comunes a todas. Devuelve
+    `(capital_final_centavos, total_aportado_centavos)`.
+    """
+    validar_crecimiento(monto_inicial, aporte_periodico, tasa_anual, plazo_anios)
+    monto, aporte, tasa = np.broadcast_arrays(
+        np.asarray(monto_inicial, dtype=float),
+        np.asarray(aporte_periodico, dtype=float),
+        np.asarray(tasa_anual, dtype=float)
+    )
+    forma = monto.shape
+    n_periodos_por_anio = FRECUENCIAS[frecuencia_aporte]
+    n_periodos_total = int(plazo_anios * n_periodos_por_anio)
+    tasa_periodica = (1 + tasa.ravel()) ** (1 / n_periodos_por_anio) - 1
+
+    monto_c = a_centavos(monto.ravel(), redondeo, escala)
+    aporte_c = a_centavos(aporte.ravel(), redondeo, escala)
+    capital_final = _crecimiento_centavos(monto_c, aporte_c, tasa_periodica, n_periodos_total, redondeo,
+                                          detalle=False)
+    total_aportado = monto_c + aporte_c * (n_periodos_total - 1)
+    return capital_final.reshape(forma), total_aportado.reshape(forma)
+
+def calcular_impuestos_centavos(capital_final, total_aportado, tasa_impuesto, redondeo="mitad_par",
+                                escala=ESCALA_CENTAVOS):
+    """Impuesto sobre la ganancia con montos en centavos enteros (vectorizado).
+
+    `tasa_impuesto` admite lo mismo que `calcular_impuestos` (tasa plana,
+    arreglo de tasas o régimen). Devuelve `(impuesto, capital_neto)` en
+    centavos int64; el capital neto es exactamente capital final − impuesto.
+    """
+    capital_final = np.asarray(capital_final, dtype=np.int64)
+    ganancia = capital_final - np.asarray(total_aportado, dtype=np.int64)
+    if isinstance(tasa_impuesto, (str, dict)):
+        # Los límites de los tramos y el exento están en unidades monetarias
+        impuesto = calcular_impuesto_ganancia(ganancia / escala, tasa_impuesto) * escala
+    else:
+        impuesto = calcular_impuesto_ganancia(ganancia, tasa_impuesto)
+    impuesto = np.where(ganancia > 0, redondear_entero(impuesto, redondeo), 0)
+    return impuesto, capital_final - impuesto
+
+def calcular_pension_mensual_centavos(capital_neto, tasa_anual_retiro, anios_pension, factor=1.0,
+                                      redondeo="mitad_par"):
+    """Pensión mensual en centavos int64 a partir de un capital neto en centavos."""
+    pension = _pension_mensual_vectorizada(np.asarray(capital_neto, dtype=np.int64), tasa_anual_retiro,
+                                           anios_pension, factor)
+    return redondear_entero(pension, redondeo)
+
+# ===================================================================
+# Metas: aporte, tasa y plazo requeridos
+# ===================================================================
+def _capital_neto_requerido(capital_objetivo, pension_objetivo, tasa_retiro, anios_pension, factor):
+    """Capital neto (post-impuestos) necesario para la meta indicada.
+
+    La meta es un capital neto o una pensión mensual; en el segundo caso se
+    invierte la fórmula de `calcular_pension_mensual`.
+    """
+    if (capital_objetivo is None) == (pension_objetivo is None):
+        raise ValueError("Indique capital_objetivo o pension_objetivo (solo uno)")
+    if capital_objetivo is not None:
+        return np.asarray(capital_objetivo, dtype=float)
+    if tasa_retiro is None or anios_pension is None:
+        raise ValueError("La meta de pensión requiere tasa_retiro y anios_pension")
+    # La pensión es lineal en el capital: basta con la pensión de 1 USD
+    return np.asarray(pension_objetivo, dtype=float) / _pension_mensual_vectorizada(
+        1.0, tasa_retiro, anios_pension, factor
+    )
+
+def _broadcast_con_regimen(tasa_impuesto, *valores):
+    """Broadcast de los parámetros de una meta y de la tasa de impuesto.
+
+    Las tasas planas entran al broadcast (una por cliente); un régimen con
+    nombre o tramos se devuelve tal cual y se aplica a todos los clientes.
+    """
+    valores = [np.asarray(valor, dtype=float) for valor in valores]
+    if isinstance(tasa_impuesto, (str, dict)):
+        return (*np.broadcast_arrays(*valores), tasa_impuesto)
+    return tuple(np.broadcast_arrays(*valores, np.asarray(tasa_impuesto, dtype=float)))
+
+def _capital_neto_cerrado(monto_inicial, aporte_periodico, tasa_periodica, n_periodos_total, tasa_impuesto):
+    """Capital neto tras impuestos (sin redondear), vectorizado.
+
+    `tasa_impuesto` es una tasa, un arreglo de tasas o un régimen, como en
+    `calcular_impuestos`.
+    """
+    capital_final = _capital_final_cerrado(monto_inicial, aporte_periodico, tasa_periodica, n_periodos_total)
+    total_aportado = monto_inicial + aporte_periodico * (n_periodos_total - 1)
+    return capital_final - calcular_impuesto_ganancia(capital_final - total_aportado, tasa_impuesto)
+
+def calcular_aporte_requerido(monto_inicial, frecuencia_aporte, tasa_anual, plazo_anios, capital_objetivo=None,
+                              tasa_impuesto=0.0, pension_objetivo=None, tasa_retiro=None, anios_pension=None,
+                              factor=1.0):
+    """Aporte periódico mínimo para alcanzar un capital neto o una pensión.
+
+    Con tasa plana la solución es cerrada: con TEA ≥ 0 la ganancia nunca es
+    negativa, así que el capital neto es lineal en el aporte. Con un
+    régimen por tramos (o exento) deja de serlo y se biseca en centavos.
+    Acepta arreglos (muchos clientes a la vez); el resultado se redondea al
+    centavo hacia arriba. Devuelve 0 si la meta ya se alcanza sin aportes e
+    `inf` si no se puede alcanzar (plazo de un solo período).
+    """
+    objetivo = _capital_neto_requerido(capital_objetivo, pension_objetivo, tasa_retiro, anios_pension, factor)
+    monto, tasa, plazo, objetivo, impuesto = _broadcast_con_regimen(tasa_impuesto, monto_inicial, tasa_anual,
+                                                                    plazo_anios, objetivo)
+    validar_crecimiento(monto, 0, tasa, plazo.min() if plazo.size else 1)
+    n_por_anio = _periodos_por_anio(np.broadcast_to(np.asarray(frecuencia_aporte, dtype=object), monto.shape))
+    n_periodos_total = plazo * n_por_anio
+    tasa_periodica = (1 + tasa) ** (1 / n_por_anio) - 1
+
+    def neto(aporte):
+        return _capital_neto_cerrado(monto, aporte, tasa_periodica, n_periodos_total, impuesto)
+
+    neto_sin_aportes = neto(0.0)
+    faltante = objetivo - neto_sin_aportes
+    con_aportes = n_periodos_total > 1
+    if isinstance(impuesto, (str, dict)):
+        # Con tasas marginales ≤ 100% el neto nunca es menor al total aportado:
+        # cubrir el faltante sin ganancias es una cota superior que sí llega
+        periodos_con_aporte = np.where(con_aportes, n_periodos_total - 1, 1)
+        superior = np.ceil(np.maximum(objetivo - monto, 0.0) / periodos_con_aporte * 100)
+        inferior = np.zeros(monto.shape)
+        # Invariante: no llega en `inferior` (o la meta ya se alcanza) y llega en `superior`
+        while np.any(superior - inferior > 1):
+            medio = np.floor((inferior + superior) / 2)
+            llega = neto(medio / 100) >= objetivo
+            superior = np.where(llega, medio, superior)
+            inferior = np.where(llega, inferior, medio)
+        return np.where(faltante <= 0, 0.0, np.where(con_aportes, superior / 100, np.inf))[()]
+
+    # neto(a) = neto(0) + a · pendiente
+    pendiente = neto(1.0) - neto_sin_aportes
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aporte = np.where(faltante <= 0, 0.0,
+                          np.where(pendiente > 0, faltante / pendiente, np.inf))
+    # Se redondea hacia arriba al centavo para que el aporte sí alcance la meta
+    return (np.ceil(np.round(aporte * 100, 6)) / 100)[()]
+
+def calcular_tasa_requerida(monto_inicial, aporte_periodico, frecuencia_aporte, plazo_anios, capital_objetivo=None,
+                            tasa_impuesto=0.0, pension_objetivo=None, tasa_retiro=None, anios_pension=None,
+                            factor=1.0, tolerancia=1e-10):
+    """TEA mínima (entre 0% y 50%) para alcanzar un capital neto o una pensión.
+
+    Bisección vectorizada: todos los clientes se bisecan a la vez. Devuelve
+    0 si la meta se alcanza con TEA 0% y NaN si no se alcanza ni con 50%.
+    """
+    objetivo = _capital_neto_requerido(capital_objetivo, pension_objetivo, tasa_retiro, anios_pension, factor)
+    monto, aporte, plazo, objetivo, impuesto = _broadcast_con_regimen(tasa_impuesto, monto_inicial,
+                                                                      aporte_periodico, plazo_anios, objetivo)
+    validar_crecimiento(monto, aporte, 0, plazo.min() if plazo.size else 1)
+    n_por_anio = _periodos_por_anio(np.broadcast_to(np.asarray(frecuencia_aporte, dtype=object), monto.shape))
+    n_periodos_total = plazo * n_por_anio
+
+    def neto(tea):
+        return _capital_neto_cerrado(monto, aporte, (1 + tea) ** (1 / n_por_anio) - 1, n_periodos_total, impuesto)
+
+    inferior = np.zeros(monto.shape)
+    superior = np.full(monto.shape, 0.5)
+    alcanzable = neto(superior) >= objetivo
+    ya_alcanzado = neto(inferior) >= objetivo
+    while np.max(superior - inferior, initial=0.0) > tolerancia:
+        medio = (inferior + superior) / 2
+        llega = neto(medio) >= objetivo
+        superior = np.where(llega, medio, superior)
+        inferior = np.where(llega, inferior, medio)
+    return np.where(ya_alcanzado, 0.0, np.where(alcanzable, superior, np.nan))[()]
+
+def calcular_plazo_requerido(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, capital_objetivo=None,
+                             tasa_impuesto=0.0, pension_objetivo=None, tasa_retiro=None, anios_pension=None,
+                             factor=1.0, plazo_maximo=100):
+    """Plazo mínimo en años enteros para alcanzar un capital neto o una pensión.
+
+    Bisección entera vectorizada sobre [1, plazo_maximo]. Devuelve NaN si
+    la meta no se alcanza dentro de `plazo_maximo` años.
+    """
+    objetivo = _capital_neto_requerido(capital_objetivo, pension_objetivo, tasa_retiro, anios_pension, factor)
+    monto, aporte, tasa, objetivo, impuesto = _broadcast_con_regimen(tasa_impuesto, monto_inicial,
+                                                                      aporte_periodico, tasa_anual, objetivo)
+    validar_crecimiento(monto, aporte, tasa, 1)
+    n_por_anio = _periodos_por_anio(np.broadcast_to(np.asarray(frecuencia_aporte, dtype=object), monto.shape))
+    tasa_periodica = (1 + tasa) ** (1 / n_por_anio) - 1
+
+    def llega(anios):
+        return _capital_neto_cerrado(monto, aporte, tasa_periodica, anios * n_por_anio, impuesto) >= objetivo
+
+    # Invariante: no llega en `inferior` (o inferior = 0) y llega en `superior`
+    inferior = np.zeros(monto.shape, dtype=np.int64)
+    superior = np.full(monto.shape, int(plazo_maximo), dtype=np.int64)
+    alcanzable = llega(superior)
+    while np.any(superior - inferior > 1):
+        medio = (inferior + superior) // 2
+        ok = llega(np.maximum(medio, 1))
+        superior = np.where(ok, medio, superior)
+        inferior = np.where(ok, inferior, medio)
+    return np.where(alcanzable, np.maximum(superior, 1), np.nan)[()]
+
+# ===================================================================
+# Ciclo de vida: acumulación → impuestos → retiro
+# ===================================================================
+def simular_ciclo_vida(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios,
+                       tasa_impuesto, tasa_anual_retiro, anios_pension, factor=1.0, detalle=True):
+    """Proyecta Módulo A, Módulo B (impuestos) y la etapa de retiro de punta a punta.
+
+    Todos los parámetros menos la frecuencia aceptan arreglos (una fila por
+    cliente); `tasa_impuesto` también puede ser un régimen (ver
+    `calcular_impuestos`), común a todos los clientes. La línea de tiempo
+    de cada cliente tiene sus períodos de acumulación (en
+    `frecuencia_aporte`) seguidos de sus meses de retiro, con la misma
+    regla de meses y pensión que `calcular_cronograma_retiro`. Como los
+    plazos difieren, la matriz `saldos` (clientes × pasos, saldo al cierre
+    de cada paso) se rellena con NaN. Con `detalle=False` solo se devuelven
+    los resúmenes por cliente.
+    """
+    monto, aporte, tasa, plazo, tasa_retiro, anios, factor, regimen = _broadcast_con_regimen(
+        tasa_impuesto, monto_inicial, aporte_periodico, tasa_anual, plazo_anios, tasa_anual_retiro,
+        anios_pension, factor
+    )
+    validar_crecimiento(monto, aporte, tasa, plazo.min() if plazo.size else 1)
+    if np.any(tasa_retiro < 0):
+        raise ValueError("La TEA no puede ser negativa")
+    forma = monto.shape
+    monto, aporte, tasa, plazo, tasa_retiro, anios, factor = (
+        x.ravel() for x in (monto, aporte, tasa, plazo, tasa_retiro, anios, factor)
+    )
+    if isinstance(regimen, np.ndarray):
+        regimen = regimen.ravel()
+
+    n_por_anio = FRECUENCIAS[frecuencia_aporte]
+    n_acumulacion = np.rint(plazo * n_por_anio).astype(int)
+    n_retiro = _meses_retiro(anios)
+    tasa_periodica = (1 + tasa) ** (1 / n_por_anio) - 1
+    tasa_mensual = (1 + tasa_retiro) ** (1 / 12) - 1
+
+    # Módulo A y Módulo B con las mismas reglas de redondeo que las funciones escalares
+    capital_final = np.round(_capital_final_cerrado(monto, aporte, tasa_periodica, n_acumulacion), 2)
+    total_aportado = monto + aporte * (n_acumulacion - 1)
+    impuesto, capital_neto = (np.asarray(x) for x in calcular_impuestos(capital_final, total_aportado, regimen))
+    # El saldo de retiro se proyecta con la pensión sin redondear (como calcular_cronograma_retiro)
+    pension = _pension_mensual_vectorizada(capital_neto, tasa_retiro, n_retiro / 12, factor)
+
+    resultado = {
+        "capital_final": capital_final.reshape(forma),
+        "total_aportado": total_aportado.reshape(forma),
+        "impuesto": impuesto.reshape(forma),
+        "capital_neto": capital_neto.reshape(forma),
+        "pension_mensual": np.round(pension, 2).reshape(forma),
+        "n_periodos_acumulacion": n_acumulacion.reshape(forma),
+        "n_meses_retiro": n_retiro.reshape(forma)
+    }
+    if not detalle:
+        return resultado
+
+    # Línea de tiempo completa en una sola pasada vectorizada
+    paso = np.arange(int((n_acumulacion + n_retiro).max()))[None, :]
+    t_acum = paso + 1
+    t_ret = paso - n_acumulacion[:, None] + 1
+    factor_acum = (1 + tasa_periodica[:, None]) ** t_acum
+    saldo_acum = (monto[:, None] * factor_acum
+                  + aporte[:, None] * _factor_aportes(factor_acum, tasa_periodica[:, None], t_acum))
+    factor_ret = (1 + tasa_mensual[:, None]) ** t_ret
+    retiros = pension[:, None] * _factor_aportes(factor_ret * (1 + tasa_mensual[:, None]),
+                                                 tasa_mensual[:, None], t_ret + 1)
+    saldo_ret = capital_neto[:, None] * factor_ret - retiros
+
+    en_acumulacion = t_ret <= 0
+    en_retiro = ~en_acumulacion & (t_ret <= n_retiro[:, None])
+    saldos = np.where(en_acumulacion & (t_acum <= n_acumulacion[:, None]), saldo_acum,
+                      np.where(en_retiro, saldo_ret, np.nan))
+    resultado["saldos"] = (np.round(saldos, 2) + 0.0).reshape(forma + (paso.size,))  # evita -0.0 al final
+    return resultado
+
+# ===================================================================
+# Proyección en términos reales (inflación)
+# ===================================================================
+def calcular_deflactores(inflacion_anual, frecuencia, n_periodos, desfase=0):
+    """Índice de precios acumulado para los períodos desfase+1 .. desfase+n.
+
+    `inflacion_anual` es una tasa anual constante o un vector con la tasa
+    anual de cada período (debe cubrir desfase + n períodos). Dividir un
+    monto nominal del período t por el índice lo lleva a moneda de hoy.
+    """
+    n_periodos_por_anio = FRECUENCIAS[frecuencia]
+    inflacion = np.asarray(inflacion_anual, dtype=float)
+    total = int(desfase + n_periodos)
+    if inflacion.ndim == 0:
+        tasas = np.full(total, float(inflacion))
+    elif inflacion.size >= total:
+        tasas = inflacion.ravel()[:total]
+    else:
+        raise ValueError("El vector de inflación debe cubrir todos los períodos")
+    if np.any(tasas <= -1):
+        raise ValueError("La inflación debe ser mayor a -100%")
+    return np.cumprod((1 + tasas) ** (1 / n_periodos_por_anio))[int(desfase):]
+
+def deflactar_cronograma(cronograma, inflacion_anual, frecuencia, desfase=0):
+    """Expresa en moneda de hoy todas las columnas monetarias de un cronograma.
+
+    `desfase` es la cantidad de períodos transcurridos antes del primer
+    período del cronograma (p. ej. los meses de acumulación antes del
+    cronograma de retiro).
+    """
+    indice = calcular_deflactores(inflacion_anual, frecuencia, len(cronograma), desfase)
+    return Cronograma({
+        nombre: cronograma[nombre] if nombre == "Periodo" else np.round(cronograma[nombre] / indice, 2)
+        for nombre in cronograma.columnas
+    })
+
+def calcular_crecimiento_cartera_real(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios,
+                                      inflacion_anual, indexar_aportes=True):
+    """Crecimiento de cartera con aportes indexados a la inflación, en nominal y real.
+
+    Con `indexar_aportes=True` el aporte del período t es `aporte_periodico`
+    por el índice de precios de ese período (constante en moneda de hoy).
+    El cronograma incluye las columnas nominales de siempre más
+    "Deflactor" y "Saldo Final Real". Devuelve
+    `(cronograma, capital_final_real, total_aportado_real)`.
+    """
+    validar_crecimiento(monto_inicial, aporte_periodico, tasa_anual, plazo_anios)
+    n_periodos_total = int(plazo_anios * FRECUENCIAS[frecuencia_aporte])
+    tasa_periodica, crecimiento, descuento = obtener_factores_tasa(tasa_anual, frecuencia_aporte, n_periodos_total)
+    indice = calcular_deflactores(inflacion_anual, frecuencia_aporte, n_periodos_total)
+
+    aportes = aporte_periodico * (indice if indexar_aportes else np.ones(n_periodos_total))
+    aportes[0] = 0.0
+    # B_t = G_t · (M + Σ_{k ≤ t} a_k / G_k): todos los saldos de una vez
+    saldo_final = crecimiento * (monto_inicial + np.cumsum(aportes * descuento))
+    saldo_inicial = np.concatenate(([monto_inicial], saldo_final[:-1]))
+    saldo_real = saldo_final / indice
+
+    cronograma = Cronograma({
+        "Periodo": np.arange(1, n_periodos_total + 1),
+        "Saldo Inicial": np.round(saldo_inicial, 2),
+        "Aporte": np.round(aportes, 2),
+        "Interés Ganado": np.round(saldo_inicial * tasa_periodica, 2),
+        "Saldo Final": np.round(saldo_final, 2),
+        "Deflactor": indice,
+        "Saldo Final Real": np.round(saldo_real, 2)
+    })
+    total_aportado_real = monto_inicial + float(np.sum(aportes / indice))
+    return cronograma, round(float(saldo_real[-1]), 2), total_aportado_real
+
+def _indice_al_retiro(inflacion_anual, anios_hasta_retiro):
+    """Índice de precios acumulado al mes del retiro (1 si el retiro es hoy).
+
+    `anios_hasta_retiro` puede ser un arreglo (un horizonte por cliente):
+    los índices se toman del mismo índice acumulado hasta el mayor horizonte.
+    """
+    meses = np.rint(np.asarray(anios_hasta_retiro, dtype=float) * 12).astype(int)
+    if np.any(meses < 0):
+        raise ValueError("Los años hasta el retiro no pueden ser negativos")
+    indice = calcular_deflactores(inflacion_anual, "Mensual", meses.max(initial=0))
+    return np.concatenate(([1.0], indice))[meses]
+
+def deflactar_pension(pension_mensual, inflacion_anual, anios_hasta_retiro):
+    """Valor en moneda de hoy de una pensión que empieza tras `anios_hasta_retiro`.
+
+    `inflacion_anual` es una tasa constante o un vector mensual, como en
+    `calcular_deflactores`.
+    """
+    indice = _indice_al_retiro(inflacion_anual, anios_hasta_retiro)
+    return np.round(np.asarray(pension_mensual, dtype=float) / indice, 2)[()]
+
+def deflactar_escenarios(df_escenarios, inflacion_anual, anios_hasta_retiro):
+    """Agrega a los escenarios de jubilación la pensión en moneda de hoy.
 
-    df_flujos = pd.DataFrame(data_flujos)
-    return round(pv_total,2), df_flujos
+    Acepta el formato largo (agrega "Pensión Mensual Real (USD)") o el
+    ancho (devuelve la tabla completa deflactada) de
+    `calcular_escenarios_jubilacion`.
+    """
+    indice = _indice_al_retiro(inflacion_anual, anios_hasta_retiro)
+    if "Pensión Mensual (USD)" not in df_escenarios.columns:
+        return (df_escenarios / indice).round(2)
+    resultado = df_escenarios.copy()
+    resultado["Pensión Mensual Real (USD)"] = np.round(df_escenarios["Pensión Mensual (USD)"].to_numpy() / indice, 2)
+    return resultado
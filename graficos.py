@@ -1,4 +1,5 @@
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 
 import plotly.express as px
@@ -77,19 +78,64 @@ def graficar_escenarios_lineas(df_escenarios):
     )
     return fig
 
+def graficar_escenarios_mapa_calor(df_escenarios_ancho):
+    """
+    Genera un mapa de calor de la pensión mensual a partir de la tabla
+    pivotada (formato="ancho") de calcular_escenarios_jubilacion.
+    Filas: TEA de retiro; columnas: años de pensión.
+    """
+    fig = go.Figure(data=go.Heatmap(
+        z=df_escenarios_ancho.values,
+        x=df_escenarios_ancho.columns,
+        y=df_escenarios_ancho.index,
+        colorscale="Viridis",
+        colorbar=dict(title="USD", tickprefix="$"),
+        hovertemplate="Años: %{x}<br>TEA: %{y}%<br>Pensión: $%{z:,.2f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title="Pensión Mensual según Años de Pensión y TEA de Retiro",
+        xaxis_title="Años de Pensión",
+        yaxis_title="Tasa TEA Retiro (%)",
+        template="plotly_white"
+    )
+    return fig
 
 
-def generar_grafico_crecimiento(df: pd.DataFrame):
-    """Genera gráfico claro: aportes acumulados vs saldo final compuesto."""
-    df['Aporte Acumulado'] = df['Aporte'].cumsum() + df['Saldo Inicial'].iloc[0]
-    df['Aporte Acumulado'] = df['Aporte Acumulado'].round(2)
+def graficar_tornado(df_sensibilidad):
+    """
+    Genera un gráfico tornado a partir de la tabla de
+    sensibilidad.analizar_sensibilidad: una barra por parámetro con el
+    cambio del resultado al bajarlo y al subirlo, el de mayor rango arriba.
+    """
+    datos = df_sensibilidad.iloc[::-1]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=datos["Parámetro"], x=datos["Delta (-)"], orientation="h", name="Bump (-)"))
+    fig.add_trace(go.Bar(y=datos["Parámetro"], x=datos["Delta (+)"], orientation="h", name="Bump (+)"))
+    fig.update_layout(
+        barmode="overlay",
+        title="Sensibilidad del Resultado por Parámetro",
+        xaxis_title="Cambio en el resultado",
+        xaxis_tickformat=",.2f",
+        template="plotly_white"
+    )
+    return fig
+
+
+def generar_grafico_crecimiento(df):
+    """Genera gráfico claro: aportes acumulados vs saldo final compuesto.
+
+    Acepta el `Cronograma` de calcular_crecimiento_cartera o un DataFrame
+    con las mismas columnas.
+    """
+    saldo_inicial = np.asarray(df['Saldo Inicial'])
+    aporte_acumulado = np.round(np.cumsum(df['Aporte']) + saldo_inicial[0], 2)
 
     fig = go.Figure()
 
     # Línea de aportes acumulados (recta ascendente)
     fig.add_trace(go.Scatter(
         x=df['Periodo'],
-        y=df['Aporte Acumulado'],
+        y=aporte_acumulado,
         mode='lines+markers',
         name='Total Aportado',
         line=dict(color='blue', width=3)
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from financiero import (
+    calcular_crecimiento_cartera_lote,
+    calcular_pension_mensual_lote,
+    calcular_pv_bonos_lote
+)
+
+# Celdas por tarea cuando una tabla doble se reparte entre procesos
+TAMANO_BLOQUE = 50000
+
+# ===================================================================
+# Modelos evaluables en lote
+# ===================================================================
+def _capital_final(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios):
+    return calcular_crecimiento_cartera_lote(
+        monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios
+    )["Capital Final"].to_numpy()
+
+def _pension_mensual(capital_neto, tasa_anual_retiro, anios_pension, factor):
+    return calcular_pension_mensual_lote(capital_neto, tasa_anual_retiro, anios_pension, factor)
+
+def _pv_bono(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios, tasa_retorno_anual):
+    return calcular_pv_bonos_lote(valor_nominal, tasa_cupon_anual, frecuencia_pago, plazo_anios,
+                                  tasa_retorno_anual)
+
+# Por modelo: función en lote, resultado y bump por defecto de cada parámetro
+# numérico, como ("absoluto", delta) o ("relativo", fracción del valor base),
+# más el rango admitido (mínimo, máximo): los bumps se recortan a ese rango.
+MODELOS = {
+    "crecimiento": {
+        "funcion": _capital_final,
+        "resultado": "Capital Final",
+        "parametros": {
+            "monto_inicial": (("relativo", 0.10), (0.0, np.inf)),
+            "aporte_periodico": (("relativo", 0.10), (0.0, np.inf)),
+            "tasa_anual": (("absoluto", 0.01), (0.0, 0.5)),
+            "plazo_anios": (("absoluto", 1), (1, np.inf))
+        }
+    },
+    "pension": {
+        "funcion": _pension_mensual,
+        "resultado": "Pensión Mensual",
+        "parametros": {
+            "capital_neto": (("relativo", 0.10), (0.0, np.inf)),
+            "tasa_anual_retiro": (("absoluto", 0.01), (0.0, np.inf)),
+            "anios_pension": (("absoluto", 1), (1, np.inf)),
+            "factor": (("absoluto", 0.10), (0.0, np.inf))
+        }
+    },
+    "bono": {
+        "funcion": _pv_bono,
+        "resultado": "Valor Presente (PV)",
+        "parametros": {
+            "valor_nominal": (("relativo", 0.10), (0.0, np.inf)),
+            "tasa_cupon_anual": (("absoluto", 0.01), (0.0, np.inf)),
+            "plazo_anios": (("absoluto", 1), (1, np.inf)),
+            "tasa_retorno_anual": (("absoluto", 0.01), (0.0, np.inf))
+        }
+    }
+}
+
+def _modelo(nombre):
+    if nombre not in MODELOS:
+        raise ValueError(f"Modelo no válido: use {', '.join(MODELOS)}")
+    return MODELOS[nombre]
+
+def _evaluar(nombre_modelo, parametros):
+    """Evalúa el modelo sobre arreglos de parámetros (una llamada en lote)."""
+    return np.asarray(_modelo(nombre_modelo)["funcion"](**parametros), dtype=float)
+
+def _bumps(modelo, base, bumps):
+    """Bump absoluto de cada parámetro a analizar (por defecto, todos los numéricos)."""
+    resultado = {}
+    for parametro, ((tipo, magnitud), _) in modelo["parametros"].items():
+        if bumps is not None and parametro not in bumps:
+            continue
+        if bumps is not None:
+            resultado[parametro] = float(bumps[parametro])
+        else:
+            resultado[parametro] = magnitud * abs(base[parametro]) if tipo == "relativo" else magnitud
+    if bumps is not None and set(bumps) - set(resultado):
+        raise ValueError("Parámetro no válido para el modelo")
+    return resultado
+
+# ===================================================================
+# Deltas y ranking tornado
+# ===================================================================
+def analizar_sensibilidad(nombre_modelo, base, bumps=None):
+    """Mueve cada parámetro ±bump y devuelve el cambio en el resultado.
+
+    `base` tiene todos los argumentos del modelo ("crecimiento", "pension"
+    o "bono"); `bumps` es un dict `{parámetro: delta absoluto}` (por
+    defecto, los de `MODELOS`). Los valores movidos se recortan al rango
+    admitido de cada parámetro. El caso base y los 2k casos movidos se
+    evalúan en una sola llamada en lote. La tabla queda ordenada por el
+    rango del resultado (ranking para un gráfico tornado).
+    """
+    modelo = _modelo(nombre_modelo)
+    deltas = _bumps(modelo, base, bumps)
+    nombres = list(deltas)
+    n_casos = 1 + 2 * len(nombres)
+
+    # Fila 0: caso base; filas 2i+1 y 2i+2: parámetro i hacia abajo y arriba
+    parametros = {clave: np.full(n_casos, valor, dtype=object if isinstance(valor, str) else float)
+                  for clave, valor in base.items()}
+    for i, parametro in enumerate(nombres):
+        minimo, maximo = modelo["parametros"][parametro][1]
+        parametros[parametro][2 * i + 1] = max(base[parametro] - deltas[parametro], minimo)
+        parametros[parametro][2 * i + 2] = min(base[parametro] + deltas[parametro], maximo)
+    resultados = _evaluar(nombre_modelo, parametros)
+
+    abajo, arriba = resultados[1::2], resultados[2::2]
+    nombre_resultado = modelo["resultado"]
+    tabla = pd.DataFrame({
+        "Parámetro": nombres,
+        "Valor Base": [base[p] for p in nombres],
+        "Valor (-)": [parametros[p][2 * i + 1] for i, p in enumerate(nombres)],
+        "Valor (+)": [parametros[p][2 * i + 2] for i, p in enumerate(nombres)],
+        f"{nombre_resultado} (-)": abajo,
+        f"{nombre_resultado} (+)": arriba,
+        "Delta (-)": np.round(abajo - resultados[0], 2),
+        "Delta (+)": np.round(arriba - resultados[0], 2),
+        "Rango": np.round(np.abs(arriba - abajo), 2)
+    })
+    tabla = tabla.sort_values("Rango", ascending=False, kind="stable").reset_index(drop=True)
+    tabla.attrs["resultado_base"] = float(resultados[0])
+    return tabla
+
+# ===================================================================
+# Tabla de sensibilidad doble
+# ===================================================================
+def tabla_sensibilidad_doble(nombre_modelo, base, parametro_filas, valores_filas, parametro_columnas,
+                             valores_columnas, n_procesos=1, tamano_bloque=TAMANO_BLOQUE):
+    """Resultado del modelo para la grilla de dos parámetros (filas × columnas).
+
+    La grilla completa se evalúa en lote; si tiene más de `tamano_bloque`
+    celdas y `n_procesos > 1`, los bloques se reparten entre procesos.
+    """
+    _modelo(nombre_modelo)
+    if parametro_filas == parametro_columnas:
+        raise ValueError("Los parámetros de filas y columnas deben ser distintos")
+    if parametro_filas not in base or parametro_columnas not in base:
+        raise ValueError("Parámetro no válido para el modelo")
+    filas = np.asarray(valores_filas, dtype=float).ravel()
+    columnas = np.asarray(valores_columnas, dtype=float).ravel()
+    celdas = filas.size * columnas.size
+
+    def parametros_bloque(inicio, fin):
+        indice = np.arange(inicio, fin)
+        parametros = dict(base)
+        parametros[parametro_filas] = filas[indice // columnas.size]
+        parametros[parametro_columnas] = columnas[indice % columnas.size]
+        return parametros
+
+    inicios = range(0, celdas, max(int(tamano_bloque), 1))
+    bloques = [parametros_bloque(i, min(i + tamano_bloque, celdas)) for i in inicios]
+    if n_procesos > 1 and len(bloques) > 1:
+        with ProcessPoolExecutor(max_workers=min(int(n_procesos), len(bloques))) as ejecutor:
+            resultados = list(ejecutor.map(_evaluar, [nombre_modelo] * len(bloques), bloques))
+    else:
+        resultados = [_evaluar(nombre_modelo, parametros) for parametros in bloques]
+
+    return pd.DataFrame(
+        np.concatenate(resultados).reshape(filas.size, columnas.size),
+        index=pd.Index(filas, name=parametro_filas),
+        columns=pd.Index(columnas, name=parametro_columnas)
+    )
@@ -0,0 +1,285 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from financiero import FRECUENCIAS, calcular_impuesto_ganancia, convertir_tea_a_tep, validar_crecimiento
+
+# --- Distribuciones soportadas para el retorno periódico ---
+DISTRIBUCIONES = ("normal", "lognormal")
+
+PERCENTILES = {"P5": 5, "P50": 50, "P95": 95}
+
+# Trayectorias por bloque: acota la memoria máxima (trayectorias × períodos por tanda)
+TAMANO_BLOQUE = 10000
+
+# Períodos sorteados a la vez dentro de un bloque
+PERIODOS_POR_TANDA = 64
+
+# ===================================================================
+# Bosquejo de cuantiles en flujo (memoria acotada)
+# ===================================================================
+class BosquejoCuantiles:
+    """Bosquejo de cuantiles con error relativo acotado y memoria fija.
+
+    Agrupa los valores positivos en cubetas logarítmicas de razón
+    gamma = (1 + e) / (1 - e), de modo que cualquier cuantil se estima con
+    error relativo ≤ e. Los bosquejos de distintos bloques se combinan
+    sumando conteos, sin guardar los valores originales.
+
+    Mientras el total de valores no supere `capacidad_exacta` también se
+    guardan los valores y los cuantiles son exactos (`np.quantile`); ver
+    `exacto`.
+    """
+
+    def __init__(self, error_relativo=0.001, capacidad_exacta=0):
+        if not 0 < error_relativo < 1:
+            raise ValueError("El error relativo debe estar entre 0 y 1")
+        self.error_relativo = error_relativo
+        self.capacidad_exacta = int(capacidad_exacta)
+        self._log_gamma = np.log1p(2 * error_relativo / (1 - error_relativo))
+        self._indice_minimo = 0
+        self._conteos = np.zeros(0, dtype=np.int64)
+        self._valores = []
+        self.ceros = 0
+        self.n = 0
+
+    @property
+    def exacto(self):
+        """True si los cuantiles se calculan sobre todos los valores (sin aproximar)."""
+        return self._valores is not None
+
+    def _ampliar(self, indice_minimo, indice_maximo):
+        """Extiende el arreglo de conteos para cubrir [indice_minimo, indice_maximo]."""
+        if self._conteos.size == 0:
+            self._indice_minimo = indice_minimo
+            self._conteos = np.zeros(indice_maximo - indice_minimo + 1, dtype=np.int64)
+            return
+        inicio = min(indice_minimo, self._indice_minimo)
+        fin = max(indice_maximo, self._indice_minimo + self._conteos.size - 1)
+        if inicio == self._indice_minimo and fin == self._indice_minimo + self._conteos.size - 1:
+            return
+        conteos = np.zeros(fin - inicio + 1, dtype=np.int64)
+        desplazamiento = self._indice_minimo - inicio
+        conteos[desplazamiento:desplazamiento + self._conteos.size] = self._conteos
+        self._indice_minimo, self._conteos = inicio, conteos
+
+    def agregar(self, valores):
+        """Agrega un arreglo de valores (no negativos) al bosquejo."""
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        positivos = valores[valores > 0]
+        self.ceros += valores.size - positivos.size
+        self.n += valores.size
+        if self._valores is not None:
+            self._valores = self._valores + [valores.copy()] if self.n <= self.capacidad_exacta else None
+        if positivos.size == 0:
+            return
+        indices = np.ceil(np.log(positivos) / self._log_gamma).astype(np.int64)
+        self._ampliar(int(indices.min()), int(indices.max()))
+        self._conteos += np.bincount(indices - self._indice_minimo, minlength=self._conteos.size)
+
+    def combinar(self, otro):
+        """Suma al bosquejo los conteos de otro con el mismo error relativo."""
+        if otro.error_relativo != self.error_relativo:
+            raise ValueError("Solo se pueden combinar bosquejos con el mismo error relativo")
+        self.ceros += otro.ceros
+        self.n += otro.n
+        if self._valores is not None:
+            exacto = otro._valores is not None and self.n <= self.capacidad_exacta
+            self._valores = self._valores + otro._valores if exacto else None
+        if otro._conteos.size == 0:
+            return
+        self._ampliar(otro._indice_minimo, otro._indice_minimo + otro._conteos.size - 1)
+        desplazamiento = otro._indice_minimo - self._indice_minimo
+        self._conteos[desplazamiento:desplazamiento + otro._conteos.size] += otro._conteos
+
+    def cuantil(self, q):
+        """Estima el cuantil q (entre 0 y 1).
+
+        Si no es `exacto`, devuelve el valor de orden ⌊q·(n − 1)⌋ con error
+        relativo ≤ `error_relativo`, sin interpolar entre valores vecinos.
+        """
+        if self.n == 0:
+            raise ValueError("El bosquejo está vacío")
+        if self._valores is not None:
+            return float(np.quantile(np.concatenate(self._valores), q))
+        rango = q * (self.n - 1)
+        if rango < self.ceros:
+            return 0.0
+        acumulado = np.cumsum(self._conteos) + self.ceros
+        indice = int(np.searchsorted(acumulado, rango, side="right")) + self._indice_minimo
+        gamma = np.exp(self._log_gamma)
+        return float(2 * gamma ** indice / (gamma + 1))
+
+# ===================================================================
+# Monte Carlo: crecimiento de cartera con retornos estocásticos
+# ===================================================================
+def _parametros_periodicos(tasa_anual, volatilidad_anual, frecuencia, distribucion):
+    """Convierte media (TEA) y volatilidad anual a parámetros por período."""
+    n_periodos_por_anio = FRECUENCIAS[frecuencia]
+    media = convertir_tea_a_tep(tasa_anual, frecuencia)
+    volatilidad = volatilidad_anual / np.sqrt(n_periodos_por_anio)
+    if distribucion == "normal":
+        return media, volatilidad
+    # Lognormal: log(1 + r) ~ N(mu, sigma) con E[r] = TEP y desvío = volatilidad
+    sigma = np.sqrt(np.log1p((volatilidad / (1 + media)) ** 2))
+    mu = np.log1p(media) - sigma ** 2 / 2
+    return mu, sigma
+
+def _simular_bloque(semilla, n_trayectorias, n_periodos, monto_inicial, aporte_periodico,
+                    parametros, distribucion, dtype, capital_objetivo, error_relativo, regimen_impuesto,
+                    capacidad_exacta):
+    """Simula un bloque de trayectorias y devuelve solo agregados del bloque.
+
+    Los retornos se sortean por tandas de `PERIODOS_POR_TANDA` períodos en
+    un búfer contiguo (períodos × trayectorias), así la memoria depende del
+    tamaño del bloque y no del horizonte.
+    """
+    rng = np.random.default_rng(semilla)
+    centro, escala = parametros
+    bufer = np.empty((min(PERIODOS_POR_TANDA, n_periodos), n_trayectorias), dtype=dtype)
+
+    saldo = np.full(n_trayectorias, monto_inicial, dtype=dtype)
+    suma_saldos = np.empty(n_periodos)
+    for inicio in range(0, n_periodos, bufer.shape[0]):
+        factores = bufer[:min(bufer.shape[0], n_periodos - inicio)]
+        rng.standard_normal(dtype=dtype, out=factores)
+        factores *= escala
+        factores += centro
+        if distribucion == "normal":
+            factores += 1
+            np.maximum(factores, 0, out=factores)  # no se pierde más del 100%
+        else:
+            np.exp(factores, out=factores)
+        for t, factor in enumerate(factores, start=inicio):
+            saldo *= factor
+            if t > 0:  # sin aporte en el primer período
+                saldo += dtype(aporte_periodico)
+            suma_saldos[t] = saldo.sum(dtype=np.float64)
+
+    bosquejo = BosquejoCuantiles(error_relativo, capacidad_exacta)
+    bosquejo.agregar(saldo)
+    saldo = saldo.astype(np.float64)
+    alcanzan = 0 if capital_objetivo is None else int(np.count_nonzero(saldo >= capital_objetivo))
+    bosquejo_neto = None
+    if regimen_impuesto is not None:
+        total_aportado = monto_inicial + aporte_periodico * (n_periodos - 1)
+        bosquejo_neto = BosquejoCuantiles(error_relativo, capacidad_exacta)
+        bosquejo_neto.agregar(saldo - calcular_impuesto_ganancia(saldo - total_aportado, regimen_impuesto))
+    return {
+        "bosquejo": bosquejo,
+        "bosquejo_neto": bosquejo_neto,
+        "suma_saldos": suma_saldos,
+        "suma": saldo.sum(),
+        "suma_cuadrados": np.dot(saldo, saldo),
+        "minimo": saldo.min(),
+        "maximo": saldo.max(),
+        "alcanzan_objetivo": alcanzan
+    }
+
+def percentiles_bosquejo(bosquejo):
+    """Percentiles de `PERCENTILES` de un bosquejo, redondeados al centavo."""
+    return {nombre: round(bosquejo.cuantil(q / 100), 2) for nombre, q in PERCENTILES.items()}
+
+def resumir_simulacion(bosquejo, suma, suma_cuadrados, minimo, maximo, alcanzan, suma_saldos, n_trayectorias,
+                       capital_objetivo, total_aportado):
+    """Resultado de una simulación a partir de los agregados de sus bloques.
+
+    Arma el diccionario de `simular_crecimiento_cartera`; `cartera` lo usa
+    para que sus simulaciones devuelvan las mismas claves.
+    """
+    media = suma / n_trayectorias
+    varianza = max(suma_cuadrados / n_trayectorias - media ** 2, 0.0)
+    return {
+        "percentiles": percentiles_bosquejo(bosquejo),
+        "percentiles_exactos": bosquejo.exacto,
+        "capital_medio": round(float(media), 2),
+        "desviacion": round(float(np.sqrt(varianza)), 2),
+        "capital_minimo": round(float(minimo), 2),
+        "capital_maximo": round(float(maximo), 2),
+        "probabilidad_objetivo": None if capital_objetivo is None else alcanzan / n_trayectorias,
+        "trayectoria_media": np.round(suma_saldos / n_trayectorias, 2),
+        "total_aportado": total_aportado
+    }
+
+def simular_crecimiento_cartera(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios,
+                                volatilidad_anual, n_trayectorias=10000, distribucion="normal",
+                                capital_objetivo=None, semilla=None, n_procesos=1,
+                                tamano_bloque=TAMANO_BLOQUE, precision="float64", error_relativo=0.001,
+                                regimen_impuesto=None):
+    """Simula el crecimiento de la cartera con retornos aleatorios por período.
+
+    La TEA es el retorno esperado y `volatilidad_anual` su desvío estándar.
+    Las trayectorias se procesan en bloques de `tamano_bloque`, cada uno con
+    un flujo aleatorio independiente derivado de `semilla`, así la memoria
+    máxima depende del bloque y no del total de trayectorias. Si todas las
+    trayectorias caben en un bloque los percentiles son exactos; si no, se
+    agregan con un `BosquejoCuantiles` y son aproximados (error relativo
+    ≤ `error_relativo`). La clave "percentiles_exactos" indica cuál se usó.
+    Con `n_procesos > 1` los bloques se reparten en procesos; el resultado
+    no depende de la cantidad de procesos. Con `regimen_impuesto` (tasa o
+    régimen de `financiero.REGIMENES_IMPUESTO`) también se reportan los
+    percentiles del capital neto de impuestos de cada trayectoria.
+    """
+    # Validaciones
+    validar_crecimiento(monto_inicial, aporte_periodico, tasa_anual, plazo_anios)
+    if volatilidad_anual < 0:
+        raise ValueError("La volatilidad no puede ser negativa")
+    if n_trayectorias < 1 or tamano_bloque < 1:
+        raise ValueError("Debe simular al menos una trayectoria")
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError("Distribución no válida")
+    if precision not in ("float64", "float32"):
+        raise ValueError("Precisión no válida")
+
+    dtype = np.dtype(precision).type
+    n_periodos = int(plazo_anios * FRECUENCIAS[frecuencia_aporte])
+    parametros = tuple(dtype(p) for p in
+                       _parametros_periodicos(tasa_anual, volatilidad_anual, frecuencia_aporte, distribucion))
+
+    # Bloques de tamaño fijo, cada uno con su propio flujo aleatorio
+    n_bloques = -(-n_trayectorias // tamano_bloque)
+    tamanos = [min(tamano_bloque, n_trayectorias - i * tamano_bloque) for i in range(n_bloques)]
+    semillas = np.random.SeedSequence(semilla).spawn(n_bloques)
+    # Con un solo bloque los valores finales ya están en memoria: cuantiles exactos
+    capacidad_exacta = tamano_bloque if n_bloques == 1 else 0
+    argumentos = (
+        semillas, tamanos, [n_periodos] * n_bloques, [monto_inicial] * n_bloques,
+        [aporte_periodico] * n_bloques, [parametros] * n_bloques, [distribucion] * n_bloques,
+        [dtype] * n_bloques, [capital_objetivo] * n_bloques, [error_relativo] * n_bloques,
+        [regimen_impuesto] * n_bloques, [capacidad_exacta] * n_bloques
+    )
+
+    # Agregación en flujo: cada bloque se combina y se descarta
+    bosquejo = BosquejoCuantiles(error_relativo, capacidad_exacta)
+    bosquejo_neto = BosquejoCuantiles(error_relativo, capacidad_exacta)
+    suma_saldos = np.zeros(n_periodos)
+    suma = suma_cuadrados = 0.0
+    minimo, maximo = np.inf, -np.inf
+    alcanzan = 0
+
+    if n_procesos > 1 and n_bloques > 1:
+        ejecutor = ProcessPoolExecutor(max_workers=min(int(n_procesos), n_bloques))
+        resultados = ejecutor.map(_simular_bloque, *argumentos)
+    else:
+        ejecutor = None
+        resultados = map(_simular_bloque, *argumentos)
+    try:
+        for r in resultados:
+            bosquejo.combinar(r["bosquejo"])
+            if r["bosquejo_neto"] is not None:
+                bosquejo_neto.combinar(r["bosquejo_neto"])
+            suma_saldos += r["suma_saldos"]
+            suma += r["suma"]
+            suma_cuadrados += r["suma_cuadrados"]
+            minimo = min(minimo, r["minimo"])
+            maximo = max(maximo, r["maximo"])
+            alcanzan += r["alcanzan_objetivo"]
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown()
+
+    resultado = resumir_simulacion(bosquejo, suma, suma_cuadrados, minimo, maximo, alcanzan, suma_saldos,
+                                   n_trayectorias, capital_objetivo,
+                                   monto_inicial + aporte_periodico * (n_periodos - 1))
+    if regimen_impuesto is not None:
+        resultado["percentiles_netos"] = percentiles_bosquejo(bosquejo_neto)
+    return resultado
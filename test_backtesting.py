@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtesting
+from backtesting import abrir_retornos, backtest_rodante, importar_retornos_csv
+from financiero import calcular_crecimiento_cartera
+
+
+def _almacen(tmp_path, retornos):
+    tabla = pd.DataFrame(retornos, columns=[f"Activo {i}" for i in range(retornos.shape[1])])
+    tabla.insert(0, "fecha", pd.date_range("1990-01-01", periods=len(tabla), freq="MS"))
+    ruta_csv = tmp_path / "retornos.csv"
+    tabla.to_csv(ruta_csv, index=False)
+    return importar_retornos_csv(str(ruta_csv))
+
+def _capital_referencia(retornos_cartera, monto_inicial, aporte_mensual):
+    """Bucle mes a mes: sin aporte en el primer mes."""
+    saldo = monto_inicial
+    for t, retorno in enumerate(retornos_cartera):
+        saldo = saldo * (1 + retorno) + (aporte_mensual if t > 0 else 0.0)
+    return saldo
+
+def test_retorno_constante_coincide_con_crecimiento_de_cartera(tmp_path):
+    ruta = _almacen(tmp_path, np.full((240, 2), 0.005))
+    tabla = backtest_rodante({"Activo 0": 0.5, "Activo 1": 0.5}, 10000.0, 500.0, 10, ruta)
+    _, capital_final, total_aportado = calcular_crecimiento_cartera(10000.0, 500.0, "Mensual", 1.005 ** 12 - 1, 10)
+    assert len(tabla) == 240 - 120 + 1
+    np.testing.assert_allclose(tabla["Capital Final"], capital_final, rtol=0, atol=0.0101)
+    assert (tabla["Total Aportado"] == total_aportado).all()
+
+def test_ventanas_coinciden_con_bucle_mensual(tmp_path):
+    retornos = np.random.default_rng(0).normal(0.006, 0.04, (600, 3))
+    ruta = _almacen(tmp_path, retornos)
+    pesos = {"Activo 0": 0.2, "Activo 1": 0.5, "Activo 2": 0.3}
+    tabla = backtest_rodante(pesos, 5000.0, 250.0, 30, ruta)
+    retornos_cartera = retornos @ np.array([0.2, 0.5, 0.3])
+    for inicio in (0, 17, len(tabla) - 1):
+        esperado = _capital_referencia(retornos_cartera[inicio:inicio + 360], 5000.0, 250.0)
+        assert tabla["Capital Final"][inicio] == pytest.approx(esperado, abs=0.0101)
+    assert tabla["Inicio"][0] == "1990-01"
+    assert tabla["Fin"][0] == "2019-12"
+
+@pytest.mark.parametrize("media", [0.02, 0.03, 0.05])
+def test_ventanas_largas_con_crecimiento_alto_coinciden_con_bucle(tmp_path, monkeypatch, media):
+    retornos = np.random.default_rng(1).normal(media, 0.02, (1500, 2))
+    ruta = _almacen(tmp_path, retornos)
+    # Bloques chicos: también se ejercita el último bloque incompleto
+    monkeypatch.setattr(backtesting, "ELEMENTOS_POR_BLOQUE", 1200 * 7)
+    tabla = backtest_rodante({"Activo 0": 0.6, "Activo 1": 0.4}, 10000.0, 500.0, 100, ruta)
+    retornos_cartera = retornos @ np.array([0.6, 0.4])
+    assert len(tabla) == 301
+    for inicio in (0, 150, 300):
+        esperado = _capital_referencia(retornos_cartera[inicio:inicio + 1200], 10000.0, 500.0)
+        assert tabla["Capital Final"][inicio] == pytest.approx(esperado, rel=1e-10)
+
+def test_backtest_valida_pesos_y_plazo(tmp_path):
+    ruta = _almacen(tmp_path, np.full((24, 2), 0.01))
+    with pytest.raises(ValueError):
+        backtest_rodante({"Activo 9": 1.0}, 1000.0, 100.0, 1, ruta)
+    with pytest.raises(ValueError):
+        backtest_rodante({"Activo 0": 0.7}, 1000.0, 100.0, 1, ruta)
+    with pytest.raises(ValueError):
+        backtest_rodante({"Activo 0": 1.0}, 1000.0, 100.0, 3, ruta)
+    activos, fechas, _ = abrir_retornos(ruta)
+    assert activos == ("Activo 0", "Activo 1") and fechas.size == 24
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from cronograma import Cronograma
+from financiero import calcular_crecimiento_cartera
+
+
+def _cronograma():
+    return Cronograma({"Periodo": [1, 2, 3, 4], "Aporte": [0.0, 100.0, 100.0, 100.0],
+                       "Saldo Final": [1010.0, 1120.1, 1231.3, 1343.6]})
+
+def test_rebanada_es_una_vista_del_cronograma():
+    cronograma = _cronograma()
+    parte = cronograma[1:3]
+    assert isinstance(parte, Cronograma) and len(parte) == 2
+    assert np.shares_memory(parte["Saldo Final"], cronograma["Saldo Final"])
+    assert parte[0] == {"Periodo": 2, "Aporte": 100.0, "Saldo Final": 1120.1}
+    assert parte.ultimo() == cronograma[2]
+    assert [fila["Periodo"] for fila in cronograma[::2]] == [1, 3]
+
+def test_columnas_son_de_solo_lectura():
+    cronograma = _cronograma()
+    with pytest.raises(ValueError):
+        cronograma["Saldo Final"][0] = 0.0
+    with pytest.raises(ValueError):
+        cronograma[1:]["Aporte"][0] = 0.0
+    # El arreglo de origen sigue siendo escribible: se guarda una vista
+    origen = np.array([1.0, 2.0])
+    Cronograma({"Saldo Final": origen})
+    origen[0] = 5.0
+
+def test_to_frame_respeta_los_tipos_y_copia_los_datos():
+    cronograma, _, _ = calcular_crecimiento_cartera(10000, 500, "Mensual", 0.08, 2)
+    tabla = cronograma.to_frame()
+    assert list(tabla.columns) == cronograma.columnas
+    assert tabla["Periodo"].dtype == np.int64
+    assert (tabla.drop(columns="Periodo").dtypes == np.float64).all()
+    tabla.loc[0, "Saldo Final"] = -1.0
+    assert cronograma["Saldo Final"][0] != -1.0
+
+def test_totales_excluyen_columnas_enteras_y_largos_distintos_fallan():
+    assert _cronograma().totales() == {"Aporte": 300.0, "Saldo Final": pytest.approx(4705.0)}
+    with pytest.raises(ValueError):
+        Cronograma({"Periodo": [1, 2], "Saldo Final": [1.0]})
@@ -0,0 +1,527 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financiero import (
+    FRECUENCIAS,
+    calcular_crecimiento_cartera,
+    calcular_analitica_bonos,
+    calcular_aporte_requerido,
+    a_centavos,
+    calcular_crecimiento_cartera_centavos,
+    calcular_crecimiento_cartera_centavos_lote,
+    calcular_crecimiento_cartera_lote,
+    calcular_cronograma_retiro,
+    calcular_escenarios_jubilacion,
+    calcular_factores_renta_vitalicia,
+    calcular_impuesto_ganancia,
+    calcular_impuestos,
+    calcular_impuestos_centavos,
+    calcular_pension_mensual,
+    calcular_pension_mensual_centavos,
+    calcular_pension_mensual_lote,
+    calcular_pension_vitalicia,
+    calcular_pv_bono,
+    calcular_pv_bono_curva,
+    calcular_pv_bono_estructurado,
+    calcular_pv_bonos_curva_lote,
+    calcular_xirr,
+    calcular_xnpv,
+    calcular_ytm_bonos,
+    calcular_deflactores,
+    convertir_tea_a_tep,
+    deflactar_escenarios,
+    deflactar_pension,
+    generar_flujos_bono,
+    info_cache_factores,
+    iterar_cronograma_crecimiento,
+    limpiar_cache_factores,
+    obtener_factor_final,
+    simular_ciclo_vida
+)
+
+
+# ===================================================================
+# Referencia: bucle original de calcular_crecimiento_cartera
+# ===================================================================
+def _crecimiento_referencia(monto_inicial, aporte_periodico, frecuencia_aporte, tasa_anual, plazo_anios):
+    n_periodos_total = plazo_anios * FRECUENCIAS[frecuencia_aporte]
+    tasa_periodica = convertir_tea_a_tep(tasa_anual, frecuencia_aporte)
+
+    data = []
+    saldo_inicial = monto_inicial
+    total_aportado = 0
+
+    for periodo in range(1, n_periodos_total + 1):
+        aporte_actual = aporte_periodico if periodo > 1 else 0
+        saldo_con_aporte = saldo_inicial + aporte_actual
+        interes_ganado = saldo_inicial * tasa_periodica
+        saldo_final = saldo_con_aporte + interes_ganado
+
+        data.append({
+            "Periodo": periodo,
+            "Saldo Inicial": round(saldo_inicial,2),
+            "Aporte": round(aporte_actual,2),
+            "Interés Ganado": round(interes_ganado,2),
+            "Saldo Final": round(saldo_final,2)
+        })
+
+        saldo_inicial = saldo_final
+        total_aportado += aporte_actual
+
+    df = pd.DataFrame(data)
+    capital_final = df["Saldo Final"].iloc[-1]
+    return df, capital_final, total_aportado + monto_inicial
+
+# El bucle acumula el saldo y la fórmula cerrada lo calcula directo: pueden
+# diferir en un centavo cuando el valor cae justo en el medio al redondear.
+UN_CENTAVO = 0.0101
+
+def _casos_aleatorios(n, semilla):
+    rng = np.random.default_rng(semilla)
+    frecuencias = [f for f in FRECUENCIAS if f != "Diaria"]
+    for _ in range(n):
+        yield (
+            round(float(rng.uniform(0, 50000)), 2),
+            round(float(rng.uniform(0, 2000)), 2),
+            frecuencias[rng.integers(len(frecuencias))],
+            round(float(rng.uniform(0, 0.5)), 4),
+            int(rng.integers(1, 41))
+        )
+
+
+# ===================================================================
+# Módulo A: crecimiento de cartera
+# ===================================================================
+@pytest.mark.parametrize("caso", list(_casos_aleatorios(200, 1)) + [
+    (10000.0, 500.0, "Mensual", 0.08, 30),
+    (0.0, 100.0, "Anual", 0.0, 1),
+    (5000.0, 0.0, "Trimestral", 0.5, 10)
+])
+def test_cronograma_coincide_con_bucle_original(caso):
+    esperado, capital_esperado, total_esperado = _crecimiento_referencia(*caso)
+    cronograma, capital_final, total_aportado = calcular_crecimiento_cartera(*caso)
+
+    tabla = cronograma.to_frame()
+    assert list(tabla.columns) == list(esperado.columns)
+    np.testing.assert_allclose(tabla.to_numpy(dtype=float), esperado.to_numpy(dtype=float), rtol=0, atol=UN_CENTAVO)
+    assert capital_final == pytest.approx(capital_esperado, abs=UN_CENTAVO)
+    assert total_aportado == pytest.approx(total_esperado)
+
+def test_sin_detalle_y_lote_coinciden_con_bucle_original():
+    casos = list(_casos_aleatorios(100, 2))
+    lote = calcular_crecimiento_cartera_lote(pd.DataFrame(casos, columns=[
+        "monto_inicial", "aporte_periodico", "frecuencia_aporte", "tasa_anual", "plazo_anios"
+    ]))
+    for i, caso in enumerate(casos):
+        _, capital_esperado, total_esperado = _crecimiento_referencia(*caso)
+        _, capital_final, total_aportado = calcular_crecimiento_cartera(*caso, detalle=False)
+        assert capital_final == pytest.approx(capital_esperado, abs=UN_CENTAVO)
+        assert total_aportado == pytest.approx(total_esperado)
+        assert lote["Capital Final"][i] == pytest.approx(capital_esperado, abs=UN_CENTAVO)
+        assert lote["Total Aportado"][i] == pytest.approx(total_esperado)
+
+@pytest.mark.parametrize("argumentos", [
+    (-1.0, 100.0, "Mensual", 0.05, 5),
+    (1000.0, 100.0, "Mensual", 0.51, 5),
+    (1000.0, 100.0, "Mensual", 0.05, 0)
+])
+def test_crecimiento_rechaza_parametros_invalidos(argumentos):
+    with pytest.raises(ValueError):
+        calcular_crecimiento_cartera(*argumentos)
+    with pytest.raises(ValueError):
+        next(iterar_cronograma_crecimiento(*argumentos))
+
+def test_cronograma_por_bloques_coincide_con_el_completo():
+    cronograma, _, _ = calcular_crecimiento_cartera(10000.0, 500.0, "Mensual", 0.08, 30)
+    bloques = [bloque.to_frame() for bloque in iterar_cronograma_crecimiento(10000.0, 500.0, "Mensual", 0.08, 30,
+                                                                           tamano_bloque=100)]
+    assert len(bloques) == 4
+    np.testing.assert_allclose(pd.concat(bloques).to_numpy(dtype=float), cronograma.to_frame().to_numpy(dtype=float),
+                               rtol=0, atol=UN_CENTAVO)
+
+
+# ===================================================================
+# Módulo B: jubilación
+# ===================================================================
+def _pension_referencia(capital_neto, tasa_anual_retiro, anios_pension, factor=1.0):
+    """Cuota de npf.pmt (pagos a fin de mes) escrita de forma explícita."""
+    tasa_mensual = convertir_tea_a_tep(tasa_anual_retiro, "Mensual")
+    n_meses = anios_pension * 12
+    if tasa_mensual == 0:
+        return round(capital_neto * factor / n_meses, 2)
+    return round(capital_neto * tasa_mensual / (1 - (1 + tasa_mensual) ** -n_meses) * factor, 2)
+
+@pytest.mark.parametrize("anios_pension", [1, 10, 25, 10.3, 12.5, 0.75])
+@pytest.mark.parametrize("tasa_anual_retiro", [0.0, 0.05, 0.12])
+def test_pension_mensual_coincide_con_pmt(tasa_anual_retiro, anios_pension):
+    esperado = _pension_referencia(100000.0, tasa_anual_retiro, anios_pension, 0.9)
+    assert calcular_pension_mensual(100000.0, tasa_anual_retiro, anios_pension, 0.9) == pytest.approx(esperado)
+
+def test_pension_mensual_coincide_con_escenarios():
+    tasas, anios = [0.0, 0.04, 0.08], [5, 10.3, 20, 27.5]
+    escenarios = calcular_escenarios_jubilacion(250000.0, tasas, anios)
+    esperado = [calcular_pension_mensual(250000.0, t, a) for t in tasas for a in anios]
+    np.testing.assert_allclose(escenarios["Pensión Mensual (USD)"], esperado)
+
+def test_pension_en_lote_usa_la_cache_de_factores():
+    limpiar_cache_factores()
+    tasas, anios = np.array([[0.0], [0.05], [0.12]]), np.array([10, 10.3, 25])
+    capitales = np.linspace(50000.0, 150000.0, 30)[:, None, None]
+    lote = calcular_pension_mensual_lote(capitales, tasas, anios)
+    # 3 tasas × 3 horizontes: un fallo por combinación, no por celda
+    assert info_cache_factores()["factor_final"].misses == 9
+    calcular_pension_mensual(80000.0, 0.05, 10.3)
+    assert info_cache_factores()["factor_final"].hits == 1
+    tasa_mensual, factor_final = obtener_factor_final(0.05, "Mensual", 123.6)
+    assert factor_final == pytest.approx((1 + tasa_mensual) ** 123.6)
+    esperado = [[[_pension_referencia(c, t, a) for a in anios] for t in tasas[:, 0]] for c in capitales[:, 0, 0]]
+    np.testing.assert_allclose(lote, esperado)
+
+
+def _impuestos_referencia(capital_final, total_aportado, tasa_impuesto):
+    """calcular_impuestos original (tasa plana)."""
+    ganancia = capital_final - total_aportado
+    if ganancia <= 0:
+        return 0.0, capital_final
+    impuesto = ganancia * tasa_impuesto
+    capital_neto = capital_final - impuesto
+    return round(impuesto,2), round(capital_neto,2)
+
+def test_impuestos_mantienen_el_redondeo_original():
+    assert calcular_impuestos(1000.10, 1000.0, 0.05) == (0.01, 1000.1)
+    rng = np.random.default_rng(3)
+    capital_final = np.round(rng.uniform(0, 500000, 3000), 2)
+    total_aportado = np.round(rng.uniform(0, 500000, 3000), 2)
+    tasas = rng.choice([0.05, 0.295], 3000)
+    esperado = np.array([_impuestos_referencia(*caso) for caso in zip(capital_final, total_aportado, tasas)])
+    impuesto, capital_neto = calcular_impuestos(capital_final, total_aportado, tasas)
+    np.testing.assert_array_equal(impuesto, esperado[:, 0])
+    np.testing.assert_array_equal(capital_neto, esperado[:, 1])
+    for caso in zip(capital_final[:200], total_aportado[:200], tasas[:200]):
+        assert calcular_impuestos(*caso) == _impuestos_referencia(*caso)
+
+REGIMEN_TRAMOS = {"tramos": ((0.0, 0.0), (20000.0, 0.1), (100000.0, 0.3)), "exento": 1000.0}
+
+def test_impuesto_por_tramos():
+    ganancia = np.array([-5.0, 0.0, 15000.0, 21000.0, 101000.0, 250000.0])
+    esperado = [0.0, 0.0, 0.0, 0.0, 8000.0, 8000.0 + 0.3 * 149000.0]
+    np.testing.assert_allclose(calcular_impuesto_ganancia(ganancia, REGIMEN_TRAMOS), esperado)
+
+@pytest.mark.parametrize("regimen", [0.05, "Bolsa Local", "Fuente Extranjera", REGIMEN_TRAMOS])
+def test_aporte_requerido_es_el_minimo_centavo(regimen):
+    montos = np.array([10000.0, 0.0, 50000.0])
+    aporte = calcular_aporte_requerido(montos, "Mensual", 0.08, 20, capital_objetivo=300000.0,
+                                       tasa_impuesto=regimen)
+    for monto, a in zip(montos, aporte):
+        def neto(aporte_periodico):
+            _, capital_final, total_aportado = calcular_crecimiento_cartera(monto, aporte_periodico, "Mensual",
+                                                                            0.08, 20, detalle=False)
+            return calcular_impuestos(capital_final, total_aportado, regimen)[1]
+        assert neto(a) >= 300000.0 - UN_CENTAVO
+        assert neto(round(a - 0.01, 2)) < 300000.0
+
+def test_aporte_requerido_con_regimen_nombrado_coincide_con_su_tasa():
+    assert (calcular_aporte_requerido(10000.0, "Mensual", 0.08, 20, capital_objetivo=300000.0,
+                                      tasa_impuesto="Bolsa Local")
+            == calcular_aporte_requerido(10000.0, "Mensual", 0.08, 20, capital_objetivo=300000.0,
+                                         tasa_impuesto=0.05))
+
+
+# ===================================================================
+# Renta vitalicia
+# ===================================================================
+def _renta_referencia(qx, edad, tasa):
+    """Suma mes a mes de v^(k/12) · l(edad + k/12) / l(edad), con l lineal en cada año."""
+    lx = [1.0]
+    for q in qx[:-1]:
+        lx.append(lx[-1] * (1 - q))
+    lx.append(0.0)
+
+    def sobrevivientes(meses):
+        anio, mes = divmod(meses, 12)
+        if anio + 1 >= len(lx):
+            return lx[anio]
+        return lx[anio] + (lx[anio + 1] - lx[anio]) * mes / 12
+
+    total = 0.0
+    for k in range(1, (len(lx) - 1 - edad) * 12 + 1):
+        total += sobrevivientes(edad * 12 + k) / sobrevivientes(edad * 12) * (1 + tasa) ** (-k / 12)
+    return total
+
+def test_renta_vitalicia_coincide_con_la_suma_mes_a_mes(tmp_path):
+    qx = [0.01, 0.02, 0.05, 0.1, 0.2, 0.4, 0.7, 0.9]
+    ruta = tmp_path / "mortalidad.csv"
+    pd.DataFrame({"edad": range(len(qx)), "sexo": "F", "qx": qx}).to_csv(ruta, index=False)
+    edades, tasas = [0, 3, 7], [0.0, 0.05, 0.2]
+    factores = calcular_factores_renta_vitalicia(edades, tasas, "F", str(ruta))
+    esperado = [[_renta_referencia(qx, edad, tasa) for tasa in tasas] for edad in edades]
+    np.testing.assert_allclose(factores, esperado, rtol=1e-12)
+    assert calcular_pension_vitalicia(100000.0, 0.05, 3, "F", ruta=str(ruta)) == round(100000.0 / esperado[1][1], 2)
+    with pytest.raises(ValueError):
+        calcular_factores_renta_vitalicia([8], [0.05], "F", str(ruta))
+
+
+# ===================================================================
+# Ciclo de vida
+# ===================================================================
+def test_ciclo_vida_coincide_con_las_funciones_escalares():
+    clientes = [(10000.0, 500.0, 0.08, 30, 0.05, 0.05, 25), (0.0, 250.0, 0.12, 15, 0.295, 0.03, 20),
+                (50000.0, 0.0, 0.0, 5, 0.05, 0.0, 10)]
+    resultado = simular_ciclo_vida(*zip(*[c[:2] for c in clientes]), "Mensual",
+                                   *zip(*[c[2:] for c in clientes]))
+    for i, (monto, aporte, tasa, plazo, impuesto_tasa, tasa_retiro, anios) in enumerate(clientes):
+        _, capital_final, total_aportado = calcular_crecimiento_cartera(monto, aporte, "Mensual", tasa, plazo)
+        impuesto, capital_neto = calcular_impuestos(capital_final, total_aportado, impuesto_tasa)
+        retiro = calcular_cronograma_retiro(capital_neto, tasa_retiro, anios)
+        assert resultado["capital_final"][i] == pytest.approx(capital_final, abs=UN_CENTAVO)
+        assert resultado["impuesto"][i] == pytest.approx(impuesto, abs=UN_CENTAVO)
+        assert resultado["capital_neto"][i] == pytest.approx(capital_neto, abs=UN_CENTAVO)
+        assert resultado["pension_mensual"][i] == calcular_pension_mensual(capital_neto, tasa_retiro, anios)
+        saldos = resultado["saldos"][i]
+        saldos = saldos[~np.isnan(saldos)]
+        np.testing.assert_allclose(saldos[plazo * 12:], retiro["Saldo Final"], rtol=0, atol=UN_CENTAVO)
+        assert saldos[-1] == 0.0
+
+@pytest.mark.parametrize("anios", [10.3, 12.96, 0.05])
+def test_retiro_con_meses_no_enteros_termina_en_cero(anios):
+    retiro = calcular_cronograma_retiro(250000.0, 0.05, anios)
+    resultado = simular_ciclo_vida(10000.0, 500.0, "Mensual", 0.08, 20, 0.05, 0.05, anios)
+    saldos = resultado["saldos"][~np.isnan(resultado["saldos"])]
+    assert len(retiro) == resultado["n_meses_retiro"] == round(anios * 12)
+    assert retiro["Saldo Final"][-1] == 0.0 and saldos[-1] == 0.0
+    assert resultado["pension_mensual"] == calcular_pension_mensual(resultado["capital_neto"], 0.05,
+                                                                    round(anios * 12) / 12)
+
+@pytest.mark.parametrize("anios", [0, 0.04])
+def test_retiro_rechaza_horizontes_menores_a_un_mes(anios):
+    with pytest.raises(ValueError, match="al menos un mes"):
+        calcular_pension_mensual(100000.0, 0.05, anios)
+    with pytest.raises(ValueError, match="al menos un mes"):
+        calcular_pension_mensual_lote(100000.0, 0.05, [10, anios])
+    with pytest.raises(ValueError, match="al menos un mes"):
+        calcular_cronograma_retiro(100000.0, 0.05, anios)
+    with pytest.raises(ValueError, match="al menos un mes"):
+        simular_ciclo_vida(10000.0, 500.0, "Mensual", 0.08, 20, 0.05, 0.05, [10, anios])
+
+
+# ===================================================================
+# Inflación
+# ===================================================================
+def test_deflactar_pension_con_inflacion_constante():
+    assert deflactar_pension(1000.0, 0.03, 20) == round(1000 / 1.03 ** 20, 2)
+    assert deflactar_pension(1000.0, 0.03, 0) == 1000.0
+
+def test_deflactar_pension_con_vector_mensual():
+    inflacion = np.concatenate((np.full(120, 0.02), np.full(120, 0.04)))
+    indice = 1.02 ** 10 * 1.04 ** 10
+    np.testing.assert_allclose(deflactar_pension([1000.0, 2500.0], inflacion, 20),
+                               np.round(np.array([1000.0, 2500.0]) / indice, 2))
+    assert calcular_deflactores(inflacion, "Mensual", 240)[-1] == pytest.approx(indice)
+
+def test_deflactar_pension_con_un_horizonte_por_cliente():
+    pensiones = deflactar_pension([1000.0, 1000.0, 2000.0], 0.03, [10, 20, 0])
+    np.testing.assert_allclose(pensiones, [round(1000 / 1.03 ** 10, 2), round(1000 / 1.03 ** 20, 2), 2000.0])
+    inflacion = np.linspace(0.02, 0.06, 240)
+    np.testing.assert_array_equal(deflactar_pension(1000.0, inflacion, [5, 20]),
+                                  [deflactar_pension(1000.0, inflacion, 5), deflactar_pension(1000.0, inflacion, 20)])
+    with pytest.raises(ValueError):
+        deflactar_pension([1000.0, 1000.0], 0.03, [10, -1])
+
+def test_deflactar_escenarios_en_ambos_formatos():
+    inflacion = np.linspace(0.01, 0.05, 180)
+    largo = calcular_escenarios_jubilacion(100000.0, [0.04, 0.06], [15, 20])
+    ancho = calcular_escenarios_jubilacion(100000.0, [0.04, 0.06], [15, 20], formato="ancho")
+    esperado = deflactar_pension(largo["Pensión Mensual (USD)"].to_numpy(), inflacion, 15)
+    np.testing.assert_allclose(deflactar_escenarios(largo, inflacion, 15)["Pensión Mensual Real (USD)"], esperado)
+    np.testing.assert_allclose(deflactar_escenarios(ancho, inflacion, 15).to_numpy().ravel(), esperado)
+
+@pytest.mark.parametrize("regimen", ["Fuente Extranjera", REGIMEN_TRAMOS])
+def test_ciclo_vida_acepta_regimenes(regimen):
+    resultado = simular_ciclo_vida([10000.0, 2000.0], [500.0, 100.0], "Mensual", 0.08, 30, regimen, 0.05, 25,
+                                   detalle=False)
+    impuesto, capital_neto = calcular_impuestos(resultado["capital_final"], resultado["total_aportado"], regimen)
+    np.testing.assert_array_equal(resultado["impuesto"], impuesto)
+    np.testing.assert_array_equal(resultado["capital_neto"], capital_neto)
+
+
+# ===================================================================
+# Módulo C: bonos
+# ===================================================================
+def _precio_bono(valor_nominal, tasa_cupon_anual, n_periodos_por_anio, plazo_anios, rendimiento_anual):
+    tasa_periodica = (1 + rendimiento_anual) ** (1 / n_periodos_por_anio) - 1
+    periodos = np.arange(1, plazo_anios * n_periodos_por_anio + 1)
+    flujos = np.full(periodos.size, valor_nominal * tasa_cupon_anual / n_periodos_por_anio)
+    flujos[-1] += valor_nominal
+    return float(np.sum(flujos / (1 + tasa_periodica) ** periodos))
+
+@pytest.mark.parametrize("frecuencia", ["Anual", "Semestral", "Trimestral", "Mensual"])
+@pytest.mark.parametrize("rendimiento", [0.0, 0.03, 0.08, 0.25])
+def test_ytm_recupera_el_rendimiento_del_precio(frecuencia, rendimiento):
+    cupones, plazos = np.array([0.0, 0.05, 0.12]), np.array([1, 7, 30])
+    precios = [_precio_bono(1000.0, c, FRECUENCIAS[frecuencia], p, rendimiento) for c, p in zip(cupones, plazos)]
+    tabla = calcular_ytm_bonos(precios, 1000.0, cupones, frecuencia, plazos)
+    np.testing.assert_allclose(tabla["YTM (TEA)"], rendimiento, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(tabla["Valor Presente (PV)"], np.round(precios, 2))
+
+def test_ytm_con_paso_de_newton_fuera_del_intervalo():
+    # Rendimiento muy negativo: el primer paso de Newton sale del intervalo y se biseca
+    tabla = calcular_ytm_bonos(1500.0, 100.0, 0.15, "Anual", 2)
+    tasa = tabla["YTM (TEA)"][0]
+    assert 15 / (1 + tasa) + 115 / (1 + tasa) ** 2 == pytest.approx(1500.0, rel=1e-9)
+
+def test_ytm_sin_solucion_devuelve_nan():
+    # Precio nulo, y cupón de 50% a precio 20 (tasa periódica > 100%); el tercero sí se resuelve
+    tabla = calcular_ytm_bonos([0.0, 20.0, 95.0], 100.0, [0.05, 0.5, 0.05], "Anual", [10, 50, 10])
+    assert tabla["YTM (TEA)"][:2].isna().all()
+    assert _precio_bono(100.0, 0.05, 1, 10, tabla["YTM (TEA)"][2]) == pytest.approx(95.0)
+
+def test_analitica_de_bono_a_mano():
+    # 2 años, cupón anual 10%, rendimiento 10%: precio a la par
+    tabla = calcular_analitica_bonos(100.0, 0.10, "Anual", 2, 0.10)
+    pv_1, pv_2 = 10 / 1.1, 110 / 1.1 ** 2
+    duracion = (pv_1 + 2 * pv_2) / 100
+    assert tabla["Valor Presente (PV)"][0] == 100.0
+    assert tabla["Duración Macaulay (años)"][0] == pytest.approx(duracion)
+    assert tabla["Duración Modificada"][0] == pytest.approx(duracion / 1.1)
+    assert tabla["Convexidad"][0] == pytest.approx((2 * pv_1 + 6 * pv_2) / (100 * 1.1 ** 2))
+
+def test_analitica_semestral_en_anios_y_coincide_con_pv():
+    tabla = calcular_analitica_bonos(1000.0, 0.0, "Semestral", 5, 0.06)
+    # Bono cupón cero: la duración Macaulay es el plazo
+    assert tabla["Duración Macaulay (años)"][0] == pytest.approx(5.0)
+    assert tabla["Valor Presente (PV)"][0] == calcular_pv_bono(1000.0, 0.0, "Semestral", 5, 0.06)[0]
+
+@pytest.mark.parametrize("amortizacion", ["bullet", "lineal", [0.05, 0.1, 0.15, 0.2, 0.0] + [0.1] * 5])
+def test_bono_amortizable_devuelve_el_nominal(amortizacion):
+    flujos = generar_flujos_bono(1000.0, "Semestral", 5, 0.08, amortizacion)
+    assert flujos["Amortización"].sum() == pytest.approx(1000.0)
+    saldo_final = flujos["Saldo Capital"] - flujos["Amortización"]
+    assert saldo_final[-1] == pytest.approx(0.0, abs=1e-9)
+    np.testing.assert_allclose(flujos["Saldo Capital"][1:], saldo_final[:-1])
+    # El cupón corre sobre el saldo vigente al inicio de cada período
+    np.testing.assert_allclose(flujos["Cupón"], flujos["Saldo Capital"] * 0.04)
+    np.testing.assert_allclose(flujos["Flujo Total"], flujos["Cupón"] + flujos["Amortización"])
+
+@pytest.mark.parametrize("amortizacion", ["bullet", "lineal", [0.5, 0.0, 0.25, 0.25]])
+def test_bono_amortizable_a_la_par_vale_el_nominal(amortizacion):
+    # Anual: el cupón coincide con la TEA de descuento en todos los períodos
+    pv, _ = calcular_pv_bono_estructurado(1000.0, "Anual", 4, 0.06, 0.06, amortizacion)
+    assert pv == pytest.approx(1000.0, abs=UN_CENTAVO)
+
+def test_bono_amortizable_rechaza_fracciones_invalidas():
+    with pytest.raises(ValueError):
+        generar_flujos_bono(1000.0, "Anual", 4, 0.06, [0.5, 0.5, 0.5, -0.5])
+    with pytest.raises(ValueError):
+        generar_flujos_bono(1000.0, "Anual", 4, 0.06, [0.5, 0.5])
+
+@pytest.mark.parametrize("frecuencia", ["Anual", "Semestral", "Mensual"])
+def test_curva_plana_da_el_mismo_precio_que_la_tasa_unica(frecuencia):
+    pv, flujos = calcular_pv_bono_curva(1000.0, 0.06, frecuencia, 10, {1: 0.07, 5: 0.07, 30: 0.07})
+    pv_esperado, flujos_esperados = calcular_pv_bono(1000.0, 0.06, frecuencia, 10, 0.07)
+    assert pv == pytest.approx(pv_esperado, abs=0.0101)
+    for columna in ("Periodo", "Flujo (Cupón)", "Flujo Descontado (PV)"):
+        np.testing.assert_allclose(flujos[columna], flujos_esperados[columna], rtol=0, atol=0.0101)
+
+def test_curva_con_pendiente_se_interpola_por_plazo():
+    curva = ([1, 10], [0.02, 0.06])
+    pv = calcular_pv_bonos_curva_lote(100.0, 0.0, "Anual", [1, 5, 10, 20], curva)
+    tasas_cero = np.array([0.02, 0.02 + 0.04 * 4 / 9, 0.06, 0.06])
+    np.testing.assert_allclose(pv, np.round(100 / (1 + tasas_cero) ** np.array([1, 5, 10, 20]), 2))
+
+
+# ===================================================================
+# Flujos con fechas irregulares (XNPV / XIRR)
+# ===================================================================
+# Ejemplo de la documentación de Excel para XNPV y XIRR
+VALORES_EXCEL = [-10000.0, 2750.0, 4250.0, 3250.0, 2750.0]
+FECHAS_EXCEL = ["2008-01-01", "2008-03-01", "2008-10-30", "2009-02-15", "2009-04-01"]
+
+def test_xnpv_y_xirr_reproducen_el_ejemplo_de_excel():
+    assert calcular_xnpv(0.09, VALORES_EXCEL, FECHAS_EXCEL) == pytest.approx(2086.6476, abs=1e-4)
+    tasa = calcular_xirr(VALORES_EXCEL, FECHAS_EXCEL)
+    assert tasa == pytest.approx(0.373362535, abs=1e-8)
+    assert calcular_xnpv(tasa, VALORES_EXCEL, FECHAS_EXCEL) == pytest.approx(0.0, abs=1e-5)
+
+def test_xirr_resuelve_varias_series_a_la_vez():
+    valores = VALORES_EXCEL + [-1000.0, 1100.0]
+    fechas = FECHAS_EXCEL + ["2020-01-01", "2020-12-31"]
+    tasas = calcular_xirr(valores, fechas, inicios=[0, 5])
+    assert tasas[0] == calcular_xirr(VALORES_EXCEL, FECHAS_EXCEL)
+    # 365 días: la TEA es el rendimiento del período
+    assert tasas[1] == pytest.approx(0.1, abs=1e-9)
+    np.testing.assert_allclose(calcular_xnpv([0.09, 0.1], valores, fechas, inicios=[0, 5]),
+                               [calcular_xnpv(0.09, VALORES_EXCEL, FECHAS_EXCEL), 0.0], atol=1e-9)
+
+@pytest.mark.parametrize("valores, fechas", [
+    ([100.0, 200.0], ["2020-01-01", "2021-01-01"]),
+    ([-100.0, -50.0, -20.0], ["2020-01-01", "2020-06-01", "2021-01-01"]),
+    ([-100.0], ["2020-01-01"])
+])
+def test_xirr_sin_cambio_de_signo_devuelve_nan(valores, fechas):
+    assert np.isnan(calcular_xirr(valores, fechas))
+    tasas = calcular_xirr(VALORES_EXCEL + valores, FECHAS_EXCEL + fechas, inicios=[0, 5])
+    assert tasas[0] == pytest.approx(0.373362535, abs=1e-8) and np.isnan(tasas[1])
+
+def test_flujos_irregulares_validan_fechas_e_inicios():
+    with pytest.raises(ValueError):
+        calcular_xirr(VALORES_EXCEL, FECHAS_EXCEL[:-1])
+    with pytest.raises(ValueError):
+        calcular_xnpv(0.09, [], [])
+    with pytest.raises(ValueError):
+        calcular_xirr(VALORES_EXCEL, FECHAS_EXCEL, inicios=[0, 5])
+    with pytest.raises(ValueError):
+        calcular_xnpv(-1.0, VALORES_EXCEL, FECHAS_EXCEL)
+
+
+# ===================================================================
+# Motor en centavos
+# ===================================================================
+@pytest.mark.parametrize("redondeo", ["mitad_par", "mitad_arriba"])
+def test_centavos_concilia_y_el_lote_coincide_con_cada_cartera(redondeo):
+    cronograma, capital_final, total_aportado = calcular_crecimiento_cartera_centavos(
+        10000.0, 500.0, "Mensual", 0.08, 20, redondeo)
+    np.testing.assert_array_equal(
+        a_centavos(cronograma["Saldo Final"]),
+        a_centavos(cronograma["Saldo Inicial"]) + a_centavos(cronograma["Aporte"])
+        + a_centavos(cronograma["Interés Ganado"]))
+    # El lote recorre las carteras con arreglos; una sola cartera, con escalares
+    montos, tasas = np.array([[0.0], [10000.0], [25000.5]]), np.array([0.0, 0.08, 0.12])
+    finales, aportados = calcular_crecimiento_cartera_centavos_lote(montos, 500.0, "Mensual", tasas, 20,
+                                                                    redondeo)
+    assert finales[1, 1] == a_centavos(capital_final) and aportados[1, 1] == a_centavos(total_aportado)
+    for i, monto in enumerate(montos[:, 0]):
+        for j, tasa in enumerate(tasas):
+            _, capital, aportado = calcular_crecimiento_cartera_centavos(monto, 500.0, "Mensual", tasa, 20,
+                                                                        redondeo)
+            assert (finales[i, j], aportados[i, j]) == (a_centavos(capital), a_centavos(aportado))
+
+@pytest.mark.parametrize("caso", list(_casos_aleatorios(30, 7)) + [(10000.0, 500.0, "Mensual", 0.08, 30)])
+def test_centavos_sigue_al_motor_de_punto_flotante(caso):
+    _, capital_final, total_aportado = calcular_crecimiento_cartera(*caso, detalle=False)
+    _, capital_centavos, aportado_centavos = calcular_crecimiento_cartera_centavos(*caso)
+    # Medio centavo de redondeo por período, capitalizado hasta el final
+    n_periodos = int(caso[4] * FRECUENCIAS[caso[2]])
+    tolerancia = 0.005 * n_periodos * (1 + caso[3]) ** caso[4]
+    assert capital_centavos == pytest.approx(capital_final, abs=tolerancia)
+    assert aportado_centavos == pytest.approx(total_aportado, abs=UN_CENTAVO)
+
+@pytest.mark.parametrize("regimen", [0.05, np.array([0.05, 0.295, 0.1, 0.0]), "Bolsa Local",
+                                     "Fuente Extranjera", REGIMEN_TRAMOS,
+                                     {"Fuente Extranjera": 0.6, "Bolsa Local": 0.4}])
+def test_impuestos_centavos_coinciden_con_punto_flotante(regimen):
+    capital_final = np.array([5000.0, 150000.37, 1234567.89, 80000.0])
+    total_aportado = np.array([6000.0, 20000.0, 300000.0, 79999.99])
+    impuesto, capital_neto = calcular_impuestos(capital_final, total_aportado, regimen)
+    impuesto_c, capital_neto_c = calcular_impuestos_centavos(a_centavos(capital_final),
+                                                             a_centavos(total_aportado), regimen)
+    np.testing.assert_array_equal(capital_neto_c, a_centavos(capital_final) - impuesto_c)
+    np.testing.assert_allclose(impuesto_c / 100, impuesto, rtol=0, atol=UN_CENTAVO)
+    np.testing.assert_allclose(capital_neto_c / 100, capital_neto, rtol=0, atol=UN_CENTAVO)
+
+def test_pension_centavos_coincide_con_punto_flotante():
+    capitales = np.array([0.0, 100000.0, 345678.91])
+    for tasa, anios in [(0.0, 20), (0.05, 25), (0.12, 10.3)]:
+        pension_c = calcular_pension_mensual_centavos(a_centavos(capitales), tasa, anios, 0.9)
+        esperado = [calcular_pension_mensual(c, tasa, anios, 0.9) for c in capitales]
+        np.testing.assert_allclose(pension_c / 100, esperado, rtol=0, atol=UN_CENTAVO)
@@ -0,0 +1,68 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from financiero import calcular_crecimiento_cartera, calcular_pension_mensual, calcular_pv_bono
+from sensibilidad import MODELOS, analizar_sensibilidad, tabla_sensibilidad_doble
+
+BASES = {
+    "crecimiento": {"monto_inicial": 10000.0, "aporte_periodico": 500.0, "frecuencia_aporte": "Mensual",
+                    "tasa_anual": 0.08, "plazo_anios": 20},
+    "pension": {"capital_neto": 300000.0, "tasa_anual_retiro": 0.05, "anios_pension": 25, "factor": 1.0},
+    "bono": {"valor_nominal": 1000.0, "tasa_cupon_anual": 0.06, "frecuencia_pago": "Semestral",
+             "plazo_anios": 10, "tasa_retorno_anual": 0.07}
+}
+
+# Dos valores por parámetro, dentro del rango admitido
+VALORES = {
+    "monto_inicial": [0.0, 25000.0], "aporte_periodico": [100.0, 800.0], "tasa_anual": [0.0, 0.12],
+    "plazo_anios": [5, 15], "capital_neto": [0.0, 150000.0], "tasa_anual_retiro": [0.0, 0.07],
+    "anios_pension": [10, 30], "factor": [0.8, 1.2], "valor_nominal": [500.0, 2000.0],
+    "tasa_cupon_anual": [0.0, 0.09], "tasa_retorno_anual": [0.03, 0.1]
+}
+
+def _escalar(nombre_modelo, parametros):
+    if nombre_modelo == "crecimiento":
+        return calcular_crecimiento_cartera(**parametros, detalle=False)[1]
+    if nombre_modelo == "pension":
+        return calcular_pension_mensual(**parametros)
+    return calcular_pv_bono(**parametros)[0]
+
+@pytest.mark.parametrize("nombre_modelo, filas, columnas", [
+    (nombre, filas, columnas)
+    for nombre, modelo in MODELOS.items()
+    for filas, columnas in permutations(modelo["parametros"], 2)
+])
+def test_tabla_doble_coincide_con_el_modelo_escalar(nombre_modelo, filas, columnas):
+    tabla = tabla_sensibilidad_doble(nombre_modelo, BASES[nombre_modelo], filas, VALORES[filas], columnas,
+                                     VALORES[columnas])
+    assert tabla.shape == (2, 2)
+    for valor_fila in VALORES[filas]:
+        for valor_columna in VALORES[columnas]:
+            parametros = {**BASES[nombre_modelo], filas: valor_fila, columnas: valor_columna}
+            esperado = _escalar(nombre_modelo, parametros)
+            assert tabla.loc[valor_fila, valor_columna] == pytest.approx(esperado, abs=0.0101)
+
+def test_tabla_doble_en_bloques_y_procesos_coincide():
+    base = BASES["crecimiento"]
+    tasas, plazos = np.linspace(0, 0.5, 30), np.arange(1, 31)
+    completa = tabla_sensibilidad_doble("crecimiento", base, "tasa_anual", tasas, "plazo_anios", plazos)
+    en_bloques = tabla_sensibilidad_doble("crecimiento", base, "tasa_anual", tasas, "plazo_anios", plazos,
+                                          n_procesos=2, tamano_bloque=200)
+    np.testing.assert_array_equal(completa.to_numpy(), en_bloques.to_numpy())
+
+@pytest.mark.parametrize("nombre_modelo", list(MODELOS))
+def test_sensibilidad_evalua_cada_parametro(nombre_modelo):
+    tabla = analizar_sensibilidad(nombre_modelo, BASES[nombre_modelo])
+    assert set(tabla["Parámetro"]) == set(MODELOS[nombre_modelo]["parametros"])
+    assert tabla.attrs["resultado_base"] == pytest.approx(_escalar(nombre_modelo, BASES[nombre_modelo]),
+                                                          abs=0.0101)
+
+def test_sensibilidad_recorta_los_bumps_al_rango():
+    base = {**BASES["crecimiento"], "tasa_anual": 0.5, "plazo_anios": 1}
+    tabla = analizar_sensibilidad("crecimiento", base).set_index("Parámetro")
+    assert tabla.loc["tasa_anual", "Valor (+)"] == 0.5
+    assert tabla.loc["tasa_anual", "Valor (-)"] == pytest.approx(0.49)
+    assert tabla.loc["plazo_anios", "Valor (-)"] == 1
+    assert tabla.loc["tasa_anual", "Delta (+)"] == 0.0
@@ -0,0 +1,141 @@
+import tracemalloc
+import warnings
+
+import numpy as np
+import pytest
+
+from cartera import calcular_glide_path, comparar_estrategias_rebalanceo, proyectar_cohorte_glide_path, simular_cartera
+from financiero import calcular_crecimiento_cartera
+import simulacion
+from simulacion import BosquejoCuantiles, simular_crecimiento_cartera
+
+
+# ===================================================================
+# Bosquejo de cuantiles
+# ===================================================================
+def test_bosquejo_exacto_mientras_cabe_en_la_capacidad():
+    valores = np.random.default_rng(0).lognormal(10, 1, 5000)
+    bosquejo = BosquejoCuantiles(capacidad_exacta=valores.size)
+    bosquejo.agregar(valores[:2000])
+    bosquejo.agregar(valores[2000:])
+    assert bosquejo.exacto
+    for q in (0.05, 0.5, 0.95):
+        assert bosquejo.cuantil(q) == np.quantile(valores, q)
+
+def test_bosquejo_aproximado_al_superar_la_capacidad():
+    valores = np.random.default_rng(1).lognormal(10, 1, 5000)
+    bosquejo = BosquejoCuantiles(0.001, capacidad_exacta=4000)
+    otro = BosquejoCuantiles(0.001, capacidad_exacta=4000)
+    bosquejo.agregar(valores[:2500])
+    otro.agregar(valores[2500:])
+    bosquejo.combinar(otro)
+    assert not bosquejo.exacto
+    for q in (0.05, 0.5, 0.95):
+        assert bosquejo.cuantil(q) == pytest.approx(np.quantile(valores, q, method="lower"), rel=0.001)
+
+
+# ===================================================================
+# Monte Carlo
+# ===================================================================
+def test_volatilidad_cero_reproduce_el_caso_deterministico():
+    _, capital_final, _ = calcular_crecimiento_cartera(10000, 500, "Mensual", 0.08, 30)
+    resultado = simular_crecimiento_cartera(10000, 500, "Mensual", 0.08, 30, 0.0, n_trayectorias=1000,
+                                            semilla=0)
+    assert resultado["percentiles_exactos"]
+    for percentil in resultado["percentiles"].values():
+        assert percentil == pytest.approx(capital_final, abs=0.01)
+
+def test_percentiles_aproximados_con_varios_bloques():
+    resultado = simular_crecimiento_cartera(10000, 500, "Mensual", 0.08, 10, 0.15, n_trayectorias=2000,
+                                            semilla=0, tamano_bloque=500)
+    assert not resultado["percentiles_exactos"]
+
+def test_resultado_no_depende_de_la_cantidad_de_procesos():
+    argumentos = (10000, 500, "Mensual", 0.08, 10, 0.15)
+    secuencial = simular_crecimiento_cartera(*argumentos, n_trayectorias=2000, semilla=3, tamano_bloque=500)
+    paralelo = simular_crecimiento_cartera(*argumentos, n_trayectorias=2000, semilla=3, tamano_bloque=500,
+                                           n_procesos=2)
+    assert secuencial["percentiles"] == paralelo["percentiles"]
+    assert secuencial["capital_medio"] == paralelo["capital_medio"]
+
+def test_memoria_del_bloque_no_depende_del_horizonte():
+    tracemalloc.start()
+    try:
+        simular_crecimiento_cartera(10000, 500, "Diaria", 0.08, 10, 0.15, n_trayectorias=2000, semilla=0)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Sortear trayectorias × períodos completo serían 2000 × 3650 × 8 B ≈ 58 MB
+    assert pico < 10e6
+
+def test_resultado_no_depende_de_la_tanda_de_periodos(monkeypatch):
+    argumentos = (10000, 500, "Mensual", 0.08, 10, 0.15)
+    referencia = simular_crecimiento_cartera(*argumentos, n_trayectorias=300, semilla=5)
+    monkeypatch.setattr(simulacion, "PERIODOS_POR_TANDA", 7)
+    en_tandas = simular_crecimiento_cartera(*argumentos, n_trayectorias=300, semilla=5)
+    assert en_tandas["percentiles"] == referencia["percentiles"]
+    np.testing.assert_array_equal(en_tandas["trayectoria_media"], referencia["trayectoria_media"])
+
+def test_cartera_con_un_bloque_reporta_percentiles_exactos():
+    resultado = simular_cartera({"Bonos": 0.5, "Acciones": 0.5}, 10000, 500, 5, n_trayectorias=500, semilla=0)
+    assert resultado["percentiles_exactos"]
+    assert resultado["percentiles"]["P5"] <= resultado["percentiles"]["P50"] <= resultado["percentiles"]["P95"]
+
+def test_estrategias_de_rebalanceo_distinguen_percentiles():
+    tabla = comparar_estrategias_rebalanceo({"Bonos": 0.4, "Acciones": 0.6}, 10000, 500, 10,
+                                            n_trayectorias=500, semilla=0)
+    assert tabla.attrs["percentiles_exactos"]
+    assert tabla["P5"].nunique() == len(tabla)
+
+def test_rebalanceo_sin_monto_inicial_no_emite_advertencias():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        tabla = comparar_estrategias_rebalanceo({"Bonos": 0.4, "Acciones": 0.6}, 0.0, 500, 5,
+                                                n_trayectorias=200, semilla=0)
+    assert (tabla["Capital Medio"] > 0).all()
+
+@pytest.mark.parametrize("argumentos", [
+    (-1.0, 100.0, "Mensual", 0.05, 5, 0.1),
+    (1000.0, 100.0, "Mensual", 0.51, 5, 0.1),
+    (1000.0, 100.0, "Mensual", 0.05, 0, 0.1),
+    (1000.0, 100.0, "Mensual", 0.05, 5, -0.1)
+])
+def test_simulacion_rechaza_parametros_invalidos(argumentos):
+    with pytest.raises(ValueError):
+        simular_crecimiento_cartera(*argumentos, n_trayectorias=10)
+
+
+# ===================================================================
+# Glide path
+# ===================================================================
+AGRESIVO = {"Acciones": 0.7, "Startups": 0.1, "Bonos": 0.2}
+CONSERVADOR = {"Bonos": 0.6, "Efectivo": 0.3, "Acciones": 0.1}
+
+@pytest.mark.parametrize("criterio, edad", [("edad", 40), ("edad", 58), ("retiro", 35)])
+def test_glide_path_monotono_y_suma_cien(criterio, edad):
+    tabla = calcular_glide_path(edad, 30, criterio, pesos_inicio=AGRESIVO, pesos_fin=CONSERVADOR)
+    pesos = tabla.drop(columns=["Año", "Edad"])
+    assert len(tabla) == 30 and set(pesos.columns) == set(AGRESIVO) | set(CONSERVADOR)
+    np.testing.assert_allclose(pesos.sum(axis=1), 100.0, atol=0.01 * pesos.shape[1])
+    for activo in pesos.columns:
+        cambios = np.diff(pesos[activo].to_numpy())
+        if AGRESIVO.get(activo, 0.0) > CONSERVADOR.get(activo, 0.0):
+            assert np.all(cambios <= 0)
+        else:
+            assert np.all(cambios >= 0)
+    # Llega a la cartera conservadora al final del recorrido
+    for activo, peso in CONSERVADOR.items():
+        assert pesos[activo].iloc[-1] == pytest.approx(peso * 100)
+
+def test_glide_path_por_edad_respeta_el_tramo_de_transicion():
+    tabla = calcular_glide_path(45, 25, pesos_inicio=AGRESIVO, pesos_fin=CONSERVADOR).set_index("Edad")
+    assert tabla.loc[50, "Acciones"] == 70.0 and tabla.loc[65, "Acciones"] == 10.0
+    assert tabla.loc[55, "Acciones"] == pytest.approx(50.0)
+
+def test_cohorte_glide_path_entre_las_carteras_fijas():
+    cohorte = proyectar_cohorte_glide_path([30, 45, 60], [35, 20, 5], 10000.0, 500.0,
+                                           pesos_inicio=AGRESIVO, pesos_fin=CONSERVADOR)
+    assert (cohorte["Capital Conservador Fijo"] <= cohorte["Capital Proyectado"]).all()
+    assert (cohorte["Capital Proyectado"] <= cohorte["Capital Agresivo Fijo"]).all()
+    # Todos se retiran a los 65: el último año de aportes es a los 64
+    np.testing.assert_allclose(cohorte["Fracción Conservadora al Retiro"], 14 / 15)